@@ -21,18 +21,29 @@ def create_app():
     # Connect to MongoDB Atlas using the connection string in MONGODB_URI.
     # We use lazy connection (connect=False) so the actual MongoClient is
     # created in each worker process after fork, avoiding PyMongo's warning.
-    # Explicitly enable TLS; optionally relax certificate validation for
-    # classroom/demo deployments where CA issues can be problematic.
+    # Pool size, timeouts, compression and TLS come from Config.
+    from app.db import connection_settings
+
     connect(
         host=app.config["MONGODB_SETTINGS"]["host"],
         db=app.config["MONGODB_SETTINGS"]["db"],
         connect=False,
-        tls=True,
-        tlsAllowInvalidCertificates=True,
+        **connection_settings(app.config),
     )
 
-    # Initialize SocketIO
-    socketio.init_app(app)
+    # Initialize SocketIO. msgpack packets are opt-in because the browser
+    # needs the matching client build (see app/assets.py).
+    socketio_options = {}
+    if app.config["SOCKETIO_SERIALIZER"] == "msgpack":
+        socketio_options["serializer"] = "msgpack"
+    if app.config["SOCKETIO_MESSAGE_QUEUE"]:
+        socketio_options["message_queue"] = app.config["SOCKETIO_MESSAGE_QUEUE"]
+    socketio.init_app(app, **socketio_options)
+
+    # Static asset URLs, long-lived caching for built assets and HTML compression
+    from app import assets
+
+    assets.init_app(app)
 
     # Register blueprints
     from app.auth import auth_bp
@@ -47,9 +58,30 @@ def create_app():
 
     app.register_blueprint(tasks_bp)
 
+    # Register CLI commands
+    from app.cli import register_commands
+
+    register_commands(app)
+
     # Register SocketIO event handlers
     from app import socketio_events
 
+    # Start the due date scheduler with the first request rather than at
+    # import time, so CLI commands and worker.py don't run a second copy
+    if app.config["DUE_DATE_SCHEDULER_ENABLED"]:
+        from app.scheduler import start_scheduler
+
+        @app.before_request
+        def ensure_scheduler():
+            start_scheduler(app)
+
+    if app.config["METRICS_ENABLED"]:
+        from app.db import pool_metrics
+
+        @app.route("/metrics")
+        def metrics():
+            return pool_metrics.render(), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
     # Register error handlers
     @app.errorhandler(404)
     def not_found_error(error):
@@ -0,0 +1,160 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import urllib.request
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip variants are built/served
+    brotli = None
+
+DIST_DIR = 'dist'
+VENDOR_DIR = 'vendor'
+MANIFEST = 'manifest.json'
+SOCKETIO_CLIENT_VERSION = '4.5.4'
+SOCKETIO_CLIENT_BUILDS = ['socket.io.min.js', 'socket.io.msgpack.min.js']
+COMPRESSIBLE = ('.js', '.css', '.svg', '.json')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+HTML_COMPRESSION_MIN_SIZE = 500
+
+
+def vendor_socketio_client(static_dir):
+    """Download the Socket.IO client builds into static/vendor if they are missing"""
+    vendor_dir = os.path.join(static_dir, VENDOR_DIR)
+    os.makedirs(vendor_dir, exist_ok=True)
+    for build in SOCKETIO_CLIENT_BUILDS:
+        path = os.path.join(vendor_dir, build)
+        if not os.path.exists(path):
+            urllib.request.urlretrieve(f'https://cdn.socket.io/{SOCKETIO_CLIENT_VERSION}/{build}', path)
+
+
+def _minify(name, content):
+    from rjsmin import jsmin
+    from rcssmin import cssmin
+
+    if name.endswith('.min.js'):
+        return content
+    if name.endswith('.js'):
+        return jsmin(content)
+    if name.endswith('.css'):
+        return cssmin(content)
+    return content
+
+
+def build_assets(static_dir):
+    """Minify, fingerprint and precompress the app's static assets into static/dist.
+
+    Writes ``name.<hash>.ext`` plus ``.gz`` (and ``.br`` when brotli is
+    installed) variants, and a manifest mapping logical names to built files.
+    """
+    vendor_socketio_client(static_dir)
+
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    sources = []
+    for folder in ('css', 'js', VENDOR_DIR):
+        for filename in sorted(os.listdir(os.path.join(static_dir, folder))):
+            sources.append(f'{folder}/{filename}')
+
+    manifest = {}
+    for name in sources:
+        with open(os.path.join(static_dir, name), encoding='utf-8') as f:
+            content = _minify(name, f.read()).encode('utf-8')
+
+        digest = hashlib.sha256(content).hexdigest()[:12]
+        base, ext = os.path.splitext(name)
+        built = f'{base}.{digest}{ext}'
+        path = os.path.join(dist_dir, built)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, 'wb') as f:
+            f.write(content)
+        if ext in COMPRESSIBLE:
+            with open(path + '.gz', 'wb') as f:
+                f.write(gzip.compress(content, compresslevel=9))
+            if brotli:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(content, quality=11))
+        manifest[name] = built
+
+    with open(os.path.join(dist_dir, MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def _accepted_encoding():
+    accepted = request.headers.get('Accept-Encoding', '')
+    if brotli and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def init_app(app):
+    """Serve built assets with far-future caching and compress HTML responses"""
+    dist_dir = os.path.join(app.static_folder, DIST_DIR)
+    manifest_path = os.path.join(dist_dir, MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    @app.route('/assets/<path:filename>', endpoint='built_asset')
+    def built_asset(filename):
+        encoding = _accepted_encoding()
+        suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding)
+        mimetype = mimetypes.guess_type(filename)[0]
+
+        if suffix and os.path.exists(os.path.join(dist_dir, filename + suffix)):
+            response = send_from_directory(dist_dir, filename + suffix, mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = send_from_directory(dist_dir, filename, mimetype=mimetype)
+
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def asset_url(name):
+        """URL of a static asset, fingerprinted when a build manifest exists"""
+        if name in manifest:
+            return url_for('built_asset', filename=manifest[name])
+        return url_for('static', filename=name)
+
+    def socketio_client_url():
+        build = 'socket.io.msgpack.min.js' if app.config['SOCKETIO_SERIALIZER'] == 'msgpack' else 'socket.io.min.js'
+        if f'{VENDOR_DIR}/{build}' in manifest:
+            return asset_url(f'{VENDOR_DIR}/{build}')
+        return f'https://cdn.socket.io/{SOCKETIO_CLIENT_VERSION}/{build}'
+
+    @app.context_processor
+    def inject_assets():
+        return {'asset_url': asset_url, 'socketio_client_url': socketio_client_url()}
+
+    @app.after_request
+    def compress_html(response):
+        if (
+            response.mimetype != 'text/html'
+            or response.status_code != 200
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+        ):
+            return response
+
+        encoding = _accepted_encoding()
+        data = response.get_data()
+        if not encoding or len(data) < HTML_COMPRESSION_MIN_SIZE:
+            return response
+
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=5))
+        else:
+            response.set_data(gzip.compress(data, compresslevel=6))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
@@ -3,6 +3,7 @@ from app.auth import auth_bp
 from app.forms import LoginForm, SignUpForm
 from app.models import User, Group, Task, Subtask
 from app.utils import login_required, get_current_user
+from app.db import secondary_reads
 
 @auth_bp.route('/')
 def index():
@@ -62,25 +63,28 @@ def dashboard():
     """Dashboard route - displays groups and progress tracking"""
     user = get_current_user()
     
-    groups = Group.objects(members=user)
+    # Display reads may come from a secondary; the fix-up below re-checks on the primary before writing
+    groups = secondary_reads(Group.objects(members=user))
     
     progress_data = []
     
     for group in groups:
-        tasks = Task.objects(group=group)
+        tasks = secondary_reads(Task.objects(group=group))
         
         for task in tasks:
             groupmate = task.assigned_to
             
-            subtasks = Subtask.objects(task=task, assigned_to=groupmate)
+            subtasks = list(secondary_reads(Subtask.objects(task=task, assigned_to=groupmate)))
             
-            if task.status == "completed" and subtasks.count() > 0:
+            if task.status == "completed" and len(subtasks) > 0:
                 all_done = all(subtask.status == 'done' for subtask in subtasks)
                 if not all_done:
+                    all_done = not Subtask.objects(task=task, assigned_to=groupmate, status__ne='done').first()
+                if not all_done:
+                    # Conditional on the primary, so a stale secondary read can't reopen twice
+                    from app.tasks.bulk import reopen_completed_task
+                    reopen_completed_task(task)
                     task.status = 'in_progress'
-                    task.save()
-                    from app.utils import emit_task_status_update
-                    emit_task_status_update(str(task.group.group_id), str(task.id))
             
             if task.status == "completed":
                 progress = 100.0
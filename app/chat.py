@@ -0,0 +1,231 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from pymongo import ReplaceOne, UpdateMany
+from app.db import secondary_reads
+from app.models import User, ChatMessage, ChatBucket, BucketedMessage
+
+
+def bucket_storage_enabled():
+    return current_app.config.get('CHAT_STORAGE') == 'bucket'
+
+
+def display_name(user):
+    return f'{user.firstname} {user.lastname}'
+
+
+def bucket_window(timestamp, minutes):
+    """Return the (start, end) of the time window that contains timestamp"""
+    window = minutes * 60
+    epoch = datetime(1970, 1, 1)
+    offset = int((timestamp - epoch).total_seconds()) // window * window
+    start = epoch + timedelta(seconds=offset)
+    return start, start + timedelta(seconds=window)
+
+
+def save_message(group, user, text, timestamp=None):
+    """Store a chat message using the configured storage mode and return it"""
+    timestamp = timestamp or datetime.utcnow()
+    user_name = display_name(user)
+
+    if not bucket_storage_enabled():
+        chat_message = ChatMessage(group=group, user=user, user_name=user_name, message=text, timestamp=timestamp)
+        chat_message.save()
+        return chat_message
+
+    config = current_app.config
+    start, end = bucket_window(timestamp, config['CHAT_BUCKET_MINUTES'])
+    message = BucketedMessage(user=user, user_name=user_name, message=text, timestamp=timestamp)
+
+    # Append to the open bucket for this window, or start a new one once it is full
+    ChatBucket.objects(
+        group=group, start=start, count__lt=config['CHAT_BUCKET_SIZE'], compacted=False
+    ).update_one(
+        push__messages=message,
+        inc__count=1,
+        min__first_timestamp=timestamp,
+        max__last_timestamp=timestamp,
+        set_on_insert__end=end,
+        upsert=True,
+    )
+    return message
+
+
+def recent_messages(group, limit=None):
+    """Return up to ``limit`` chat messages for a group in chronological order"""
+    limit = limit or current_app.config['CHAT_HISTORY_LIMIT']
+
+    if not bucket_storage_enabled():
+        newest = secondary_reads(ChatMessage.objects(group=group)).order_by('-timestamp').limit(limit)
+        return list(reversed(list(newest)))
+
+    # Read whole buckets newest-first until enough messages are collected. A busy
+    # window spills into several buckets with the same start, so break ties on
+    # first_timestamp and sort the collected messages before taking the newest
+    messages = []
+    buckets = secondary_reads(ChatBucket.objects(group=group)).order_by('-start', '-first_timestamp')
+    for bucket in buckets:
+        messages.extend(bucket.messages)
+        if len(messages) >= limit:
+            break
+    messages.sort(key=lambda m: m.timestamp)
+    return messages[-limit:]
+
+
+def delete_group_messages(group):
+    ChatMessage.objects(group=group).delete()
+    ChatBucket.objects(group=group).delete()
+
+
+def migrate_messages_to_buckets(batch_size=1000):
+    """Pack existing one-document-per-message history into buckets.
+
+    Messages are grouped per (group, window) and written with one upsert
+    per chunk of at most CHAT_BUCKET_SIZE messages, then the source
+    documents are removed batch by batch.
+    """
+    config = current_app.config
+    size = config['CHAT_BUCKET_SIZE']
+    moved = 0
+    while True:
+        batch = list(ChatMessage.objects.order_by('id').limit(batch_size).no_dereference())
+        if not batch:
+            return moved
+
+        packed = {}
+        for msg in batch:
+            start, end = bucket_window(msg.timestamp, config['CHAT_BUCKET_MINUTES'])
+            packed.setdefault((msg.group.id, start, end), []).append(
+                BucketedMessage(
+                    id=msg.id, user=msg.user, user_name=msg.user_name, message=msg.message, timestamp=msg.timestamp
+                )
+            )
+
+        for (group_id, start, end), messages in packed.items():
+            messages.sort(key=lambda m: m.timestamp)
+            for i in range(0, len(messages), size):
+                chunk = messages[i:i + size]
+                # Only top up a bucket with room for the whole chunk, otherwise start a new one
+                ChatBucket.objects(
+                    group=group_id, start=start, count__lte=size - len(chunk), compacted=False
+                ).update_one(
+                    push_all__messages=chunk,
+                    inc__count=len(chunk),
+                    min__first_timestamp=chunk[0].timestamp,
+                    max__last_timestamp=chunk[-1].timestamp,
+                    set_on_insert__end=end,
+                    upsert=True,
+                )
+
+        ChatMessage.objects(id__in=[msg.id for msg in batch]).delete()
+        moved += len(batch)
+
+
+def compact_buckets(older_than, batch_size=200):
+    """Repack each group's buckets that started before ``older_than`` into
+    fewer, larger buckets of up to CHAT_COMPACT_BUCKET_SIZE messages.
+
+    A group is repacked ``batch_size`` source buckets at a time. Each new
+    bucket takes the id of its first message and is written with a
+    replace-upsert before its sources are deleted, so a rerun after an
+    interruption rewrites the same buckets instead of duplicating messages.
+    """
+    size = current_app.config['CHAT_COMPACT_BUCKET_SIZE']
+    collection = ChatBucket._get_collection()
+    compacted = 0
+
+    for group in ChatBucket.objects(start__lt=older_than, compacted=False).distinct('group'):
+        while True:
+            buckets = list(
+                ChatBucket.objects(group=group, start__lt=older_than, compacted=False)
+                .order_by('start', 'first_timestamp', 'id')
+                .limit(batch_size)
+            )
+            if len(buckets) < 2:
+                break
+
+            packed = []
+            current = None
+            for bucket in buckets:
+                for message in sorted(bucket.messages, key=lambda m: m.timestamp):
+                    if current is None or current.count >= size:
+                        current = ChatBucket(
+                            id=message.id, group=group, start=bucket.start, end=bucket.end, compacted=True
+                        )
+                        packed.append(current)
+                    current.messages.append(message)
+                    current.count += 1
+                    current.first_timestamp = current.first_timestamp or message.timestamp
+                    current.last_timestamp = message.timestamp
+                    current.end = bucket.end
+
+            if packed:
+                collection.bulk_write(
+                    [ReplaceOne({'_id': bucket.id}, bucket.to_mongo(), upsert=True) for bucket in packed],
+                    ordered=False,
+                )
+            ChatBucket.objects(id__in=[bucket.id for bucket in buckets]).delete()
+            compacted += len(buckets)
+
+    return compacted
+
+
+def archive_buckets(older_than, batch_size=500):
+    """Move buckets that ended before ``older_than`` to the chat_buckets_archive collection"""
+    collection = ChatBucket._get_collection()
+    archive = collection.database['chat_buckets_archive']
+    archived = 0
+
+    while True:
+        docs = list(collection.find({'end': {'$lt': older_than}}).limit(batch_size))
+        if not docs:
+            return archived
+        # Replace-upserts keep the copy idempotent if a previous run was interrupted
+        archive.bulk_write([ReplaceOne({'_id': doc['_id']}, doc, upsert=True) for doc in docs], ordered=False)
+        collection.delete_many({'_id': {'$in': [doc['_id'] for doc in docs]}})
+        archived += len(docs)
+
+
+def _author_name_updates(names):
+    """Build bulk updates that set the stored author name for each user id"""
+    message_updates = [UpdateMany({'user': user_id}, {'$set': {'user_name': name}}) for user_id, name in names.items()]
+    bucket_updates = [
+        UpdateMany(
+            {'messages.user': user_id},
+            {'$set': {'messages.$[m].user_name': name}},
+            array_filters=[{'m.user': user_id}],
+        )
+        for user_id, name in names.items()
+    ]
+    return message_updates, bucket_updates
+
+
+def rename_author(user):
+    """Rewrite the stored author name on all of a user's messages after a name change"""
+    message_updates, bucket_updates = _author_name_updates({user.id: display_name(user)})
+    result = ChatMessage._get_collection().bulk_write(message_updates, ordered=False)
+    bucket_result = ChatBucket._get_collection().bulk_write(bucket_updates, ordered=False)
+    return result.modified_count + bucket_result.modified_count
+
+
+def backfill_author_names(batch_size=500):
+    """Store author names on messages saved before names were snapshotted.
+
+    Authors are looked up in batches and each batch is written with one
+    bulk request per collection.
+    """
+    messages = ChatMessage._get_collection()
+    buckets = ChatBucket._get_collection()
+    author_ids = set(messages.distinct('user', {'user_name': None}))
+    author_ids.update(buckets.distinct('messages.user', {'messages': {'$elemMatch': {'user_name': None}}}))
+    author_ids = list(author_ids)
+
+    updated = 0
+    for i in range(0, len(author_ids), batch_size):
+        users = User.objects(id__in=author_ids[i:i + batch_size]).only('id', 'firstname', 'lastname')
+        names = {user.id: display_name(user) for user in users}
+        if not names:
+            continue
+        message_updates, bucket_updates = _author_name_updates(names)
+        updated += messages.bulk_write(message_updates, ordered=False).modified_count
+        updated += buckets.bulk_write(bucket_updates, ordered=False).modified_count
+    return updated
@@ -0,0 +1,127 @@
+import click
+from datetime import datetime, timedelta
+from app.models import User
+
+
+def register_commands(app):
+    """Register the app's maintenance commands with the Flask CLI"""
+
+    @app.cli.command('import-tasks')
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--created-by', 'creator_email', required=True, help='Email of the user recorded as task creator.')
+    def import_tasks(path, creator_email):
+        """Bulk create tasks and subtasks from a CSV or JSON plan file"""
+        from app.tasks.bulk import PlanError, parse_plan, import_plan
+
+        creator = User.objects(email=creator_email).first()
+        if not creator:
+            raise click.ClickException(f'User with email {creator_email} not found.')
+
+        fmt = 'csv' if path.lower().endswith('.csv') else 'json'
+        with open(path, 'rb') as f:
+            raw = f.read()
+
+        try:
+            result = import_plan(parse_plan(raw, fmt), creator, require_membership=False)
+        except PlanError as e:
+            for error in e.errors:
+                click.echo(error, err=True)
+            raise click.ClickException(f'{len(e.errors)} error(s) in plan, nothing was imported.')
+
+        click.echo(
+            f"Created {result['tasks_created']} tasks and {result['subtasks_created']} subtasks "
+            f"across {len(result['groups'])} groups."
+        )
+
+    @app.cli.command('chat-migrate-buckets')
+    def chat_migrate_buckets():
+        """Pack existing per-message chat documents into buckets"""
+        from app.chat import migrate_messages_to_buckets
+
+        click.echo(f'Moved {migrate_messages_to_buckets()} messages into buckets.')
+
+    @app.cli.command('chat-compact')
+    @click.option('--days', default=7, show_default=True, help='Compact buckets older than this many days.')
+    def chat_compact(days):
+        """Repack old chat buckets into fewer, larger documents"""
+        from app.chat import compact_buckets
+
+        count = compact_buckets(datetime.utcnow() - timedelta(days=days))
+        click.echo(f'Compacted {count} buckets.')
+
+    @app.cli.command('chat-archive')
+    @click.option('--days', default=180, show_default=True, help='Archive buckets older than this many days.')
+    def chat_archive(days):
+        """Move old chat buckets to the archive collection"""
+        from app.chat import archive_buckets
+
+        count = archive_buckets(datetime.utcnow() - timedelta(days=days))
+        click.echo(f'Archived {count} buckets.')
+
+    @app.cli.command('chat-backfill-names')
+    def chat_backfill_names():
+        """Store author names on chat messages that predate name snapshots"""
+        from app.chat import backfill_author_names
+
+        click.echo(f'Updated {backfill_author_names()} documents.')
+
+    @app.cli.command('chat-rename-author')
+    @click.argument('email')
+    def chat_rename_author(email):
+        """Rewrite the stored author name on a user's messages after a name change"""
+        from app.chat import rename_author
+
+        user = User.objects(email=email).first()
+        if not user:
+            raise click.ClickException(f'User with email {email} not found.')
+        click.echo(f'Updated {rename_author(user)} documents.')
+
+    @app.cli.command('build-assets')
+    def build_assets():
+        """Minify, fingerprint and precompress static assets into static/dist"""
+        from app.assets import build_assets
+
+        manifest = build_assets(app.static_folder)
+        click.echo(f'Built {len(manifest)} assets.')
+
+    @app.cli.command('progress-seed')
+    def progress_seed():
+        """Initialise progress totals for groups created before progress snapshots"""
+        from app.models import Group
+        from app.progress import seed_group_progress
+
+        count = 0
+        for group in Group.objects.only('id', 'group_id'):
+            seed_group_progress(group)
+            count += 1
+        click.echo(f'Seeded progress totals for {count} groups.')
+
+    @app.cli.command('workload-rebuild')
+    def workload_rebuild():
+        """Recompute the member workload index for every group"""
+        from app.models import Group
+        from app.workload import rebuild_group_workload
+
+        count = 0
+        for group in Group.objects.only('id', 'group_id'):
+            rebuild_group_workload(group)
+            count += 1
+        click.echo(f'Rebuilt workload for {count} groups.')
+
+    @app.cli.command('db-check')
+    def db_check():
+        """Show the MongoDB topology and time a primary and a secondary-routed read"""
+        import time
+        from mongoengine.connection import get_db
+        from app.db import secondary_collection, pool_metrics
+
+        db = get_db()
+        hello = db.command('ismaster')
+        click.echo(f"Replica set: {hello.get('setName', '(none)')}, hosts: {', '.join(hello.get('hosts', []))}")
+
+        for label, collection in (('primary', User._get_collection()), ('secondary', secondary_collection(User))):
+            started = time.perf_counter()
+            collection.find_one()
+            click.echo(f'{label} read ({collection.read_preference.name}): {(time.perf_counter() - started) * 1000:.1f} ms')
+
+        click.echo(pool_metrics.render())
@@ -0,0 +1,138 @@
+import threading
+import time
+from flask import current_app
+from pymongo import monitoring
+from pymongo.read_preferences import SecondaryPreferred
+
+
+class PoolWaitMetrics(monitoring.ConnectionPoolListener):
+    """Time spent waiting to check a connection out of the MongoDB pool.
+
+    Check-outs happen synchronously on the requesting thread, so the start
+    time is kept thread-locally between the started and checked-out events.
+    """
+
+    BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.failures = 0
+        self.histogram = [0] * (len(self.BUCKETS) + 1)
+
+    def _observe(self, waited):
+        with self._lock:
+            self.count += 1
+            self.total += waited
+            self.max = max(self.max, waited)
+            for i, bound in enumerate(self.BUCKETS):
+                if waited <= bound:
+                    self.histogram[i] += 1
+                    break
+            else:
+                self.histogram[-1] += 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        started = getattr(self._local, 'started', None)
+        if started is not None:
+            self._observe(time.perf_counter() - started)
+            self._local.started = None
+
+    def connection_check_out_failed(self, event):
+        self._local.started = None
+        with self._lock:
+            self.failures += 1
+
+    # The remaining pool events are not needed for wait time
+    def pool_created(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def connection_checked_in(self, event):
+        pass
+
+    def render(self):
+        """Prometheus text exposition of the pool wait histogram"""
+        with self._lock:
+            lines = [
+                '# HELP mongo_pool_wait_seconds Time spent waiting for a MongoDB pool connection.',
+                '# TYPE mongo_pool_wait_seconds histogram',
+            ]
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, self.histogram):
+                cumulative += count
+                lines.append(f'mongo_pool_wait_seconds_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f'mongo_pool_wait_seconds_bucket{{le="+Inf"}} {self.count}')
+            lines.append(f'mongo_pool_wait_seconds_sum {self.total}')
+            lines.append(f'mongo_pool_wait_seconds_count {self.count}')
+            lines.append('# TYPE mongo_pool_wait_seconds_max gauge')
+            lines.append(f'mongo_pool_wait_seconds_max {self.max}')
+            lines.append('# TYPE mongo_pool_checkout_failures_total counter')
+            lines.append(f'mongo_pool_checkout_failures_total {self.failures}')
+        return '\n'.join(lines) + '\n'
+
+
+pool_metrics = PoolWaitMetrics()
+
+
+def connection_settings(config):
+    """Keyword arguments for mongoengine.connect built from Config"""
+    settings = {
+        'maxPoolSize': config['MONGODB_MAX_POOL_SIZE'],
+        'minPoolSize': config['MONGODB_MIN_POOL_SIZE'],
+        'waitQueueTimeoutMS': config['MONGODB_WAIT_QUEUE_TIMEOUT_MS'],
+        'connectTimeoutMS': config['MONGODB_CONNECT_TIMEOUT_MS'],
+        'serverSelectionTimeoutMS': config['MONGODB_SERVER_SELECTION_TIMEOUT_MS'],
+        'socketTimeoutMS': config['MONGODB_SOCKET_TIMEOUT_MS'],
+        'event_listeners': [pool_metrics],
+    }
+    if config['MONGODB_COMPRESSORS']:
+        settings['compressors'] = config['MONGODB_COMPRESSORS']
+    if config['MONGODB_TLS']:
+        # Optionally relax certificate validation for classroom/demo deployments
+        settings['tls'] = True
+        settings['tlsAllowInvalidCertificates'] = config['MONGODB_TLS_ALLOW_INVALID_CERTIFICATES']
+    return settings
+
+
+def secondary_read_preference():
+    """Read preference for read-heavy views, or None when secondary reads are disabled"""
+    if not current_app.config['MONGODB_SECONDARY_READS']:
+        return None
+    return SecondaryPreferred(max_staleness=current_app.config['MONGODB_MAX_STALENESS_SECONDS'])
+
+
+def secondary_reads(queryset):
+    """Route a display-only queryset to secondaries within the configured staleness bound.
+
+    Never use this for authorization checks or for reads that feed writes.
+    """
+    preference = secondary_read_preference()
+    return queryset.read_preference(preference) if preference else queryset
+
+
+def secondary_collection(document):
+    """The raw collection for ``document`` with the secondary read preference applied"""
+    collection = document._get_collection()
+    preference = secondary_read_preference()
+    return collection.with_options(read_preference=preference) if preference else collection
@@ -0,0 +1,47 @@
+from flask import current_app
+from app.models import GroupEvent, GroupEventSequence
+
+# Trim the log every this many events rather than on every write
+TRIM_INTERVAL = 50
+
+
+def record_event(group_id, event, data):
+    """Append an event to the group's log and return its sequence number"""
+    group_id = str(group_id)
+    counter = GroupEventSequence.objects(group_id=group_id).modify(upsert=True, new=True, inc__seq=1)
+    seq = counter.seq
+
+    GroupEvent(group_id=group_id, seq=seq, event=event, data=data).save()
+
+    log_size = current_app.config['EVENT_LOG_SIZE']
+    if seq % TRIM_INTERVAL == 0 and seq > log_size:
+        GroupEvent.objects(group_id=group_id, seq__lte=seq - log_size).delete()
+
+    return seq
+
+
+def current_seq(group_id):
+    counter = GroupEventSequence.objects(group_id=str(group_id)).first()
+    return counter.seq if counter else 0
+
+
+def events_since(group_id, since):
+    """Return the events after ``since``, or None if the gap can no longer be
+    replayed (trimmed from the log or larger than EVENT_REPLAY_LIMIT)."""
+    latest = current_seq(group_id)
+    if since >= latest:
+        return []
+    if latest - since > current_app.config['EVENT_REPLAY_LIMIT']:
+        return None
+
+    events = list(GroupEvent.objects(group_id=str(group_id), seq__gt=since, seq__lte=latest).order_by('seq'))
+    # A seq is allocated before its event is saved, so a slow or failed writer
+    # can leave a hole anywhere in the range; only a complete run is replayable
+    if [event.seq for event in events] != list(range(since + 1, latest + 1)):
+        return None
+    return events
+
+
+def delete_group_events(group_id):
+    GroupEvent.objects(group_id=str(group_id)).delete()
+    GroupEventSequence.objects(group_id=str(group_id)).delete()
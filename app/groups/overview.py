@@ -0,0 +1,123 @@
+from datetime import datetime
+from flask import current_app
+from app.db import secondary_collection
+from app.models import Group, Task, ChatMessage, ChatBucket, MemberWorkload, ChatReadMarker
+
+# Unread counts stop at this many; the badge then shows "99+"
+UNREAD_BADGE_CAP = 99
+
+
+def mark_chat_read(user, group_id, when=None):
+    ChatReadMarker.objects(user=user, group_id=str(group_id)).update_one(
+        upsert=True, set__last_read_at=when or datetime.utcnow()
+    )
+
+
+def delete_group_read_markers(group_id):
+    ChatReadMarker.objects(group_id=str(group_id)).delete()
+
+
+def _unread_lookup(user_id):
+    """$lookup stage counting messages from other members since the user's read marker"""
+    if current_app.config.get('CHAT_STORAGE') == 'bucket':
+        return {'$lookup': {
+            'from': ChatBucket._get_collection_name(),
+            'let': {'gid': '$_id', 'since': '$last_read_at'},
+            'pipeline': [
+                {'$match': {'$expr': {'$and': [
+                    {'$eq': ['$group', '$$gid']},
+                    {'$gt': ['$last_timestamp', '$$since']},
+                ]}}},
+                {'$sort': {'start': -1}},
+                {'$limit': UNREAD_BADGE_CAP + 1},
+                {'$project': {'n': {'$size': {'$filter': {'input': '$messages', 'cond': {'$and': [
+                    {'$gt': ['$$this.timestamp', '$$since']},
+                    {'$ne': ['$$this.user', user_id]},
+                ]}}}}}},
+                {'$group': {'_id': None, 'n': {'$sum': '$n'}}},
+            ],
+            'as': 'unread',
+        }}
+
+    return {'$lookup': {
+        'from': ChatMessage._get_collection_name(),
+        'let': {'gid': '$_id', 'since': '$last_read_at'},
+        'pipeline': [
+            {'$match': {'$expr': {'$and': [
+                {'$eq': ['$group', '$$gid']},
+                {'$gt': ['$timestamp', '$$since']},
+                {'$ne': ['$user', user_id]},
+            ]}}},
+            {'$limit': UNREAD_BADGE_CAP + 1},
+            {'$count': 'n'},
+        ],
+        'as': 'unread',
+    }}
+
+
+def groups_overview(user):
+    """All of a user's groups with open task, own pending subtask and unread chat counts.
+
+    Runs as a single aggregation over the groups collection; own pending
+    subtasks come from the member workload index.
+    """
+    user_id = user.id
+    pipeline = [
+        {'$match': {'members': user_id}},
+        {'$sort': {'created_at': -1}},
+        {'$lookup': {
+            'from': Task._get_collection_name(),
+            'let': {'gid': '$_id'},
+            'pipeline': [
+                {'$match': {'$expr': {'$and': [
+                    {'$eq': ['$group', '$$gid']},
+                    {'$ne': ['$status', 'completed']},
+                ]}}},
+                {'$count': 'n'},
+            ],
+            'as': 'open_tasks',
+        }},
+        {'$lookup': {
+            'from': MemberWorkload._get_collection_name(),
+            'let': {'gid': '$group_id'},
+            'pipeline': [
+                {'$match': {'$expr': {'$and': [
+                    {'$eq': ['$group_id', '$$gid']},
+                    {'$eq': ['$user', user_id]},
+                ]}}},
+                {'$project': {'n': '$open_subtasks'}},
+            ],
+            'as': 'my_subtasks',
+        }},
+        {'$lookup': {
+            'from': ChatReadMarker._get_collection_name(),
+            'let': {'gid': '$group_id'},
+            'pipeline': [
+                {'$match': {'$expr': {'$and': [
+                    {'$eq': ['$group_id', '$$gid']},
+                    {'$eq': ['$user', user_id]},
+                ]}}},
+                {'$project': {'last_read_at': 1}},
+            ],
+            'as': 'read_marker',
+        }},
+        {'$addFields': {'last_read_at': {'$ifNull': [
+            {'$arrayElemAt': ['$read_marker.last_read_at', 0]}, datetime(1970, 1, 1)
+        ]}}},
+        _unread_lookup(user_id),
+        {'$project': {
+            'group_id': 1,
+            'name': 1,
+            'description': 1,
+            'created_at': 1,
+            'member_count': {'$size': '$members'},
+            'open_tasks': {'$ifNull': [{'$arrayElemAt': ['$open_tasks.n', 0]}, 0]},
+            'my_pending_subtasks': {'$ifNull': [{'$arrayElemAt': ['$my_subtasks.n', 0]}, 0]},
+            'unread': {'$ifNull': [{'$arrayElemAt': ['$unread.n', 0]}, 0]},
+        }},
+    ]
+
+    groups = list(secondary_collection(Group).aggregate(pipeline))
+    for group in groups:
+        group['unread_label'] = f'{UNREAD_BADGE_CAP}+' if group['unread'] > UNREAD_BADGE_CAP else str(group['unread'])
+    return groups
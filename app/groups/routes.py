@@ -1,7 +1,13 @@
-from flask import render_template, redirect, url_for, flash, request
+from flask import render_template, redirect, url_for, flash, request, jsonify
+from datetime import datetime
 from app.groups import groups_bp
 from app.forms import CreateGroupForm
-from app.models import User, Group, Task, Subtask, ChatMessage
+from app.models import User, Group, Task, Subtask
+from app.chat import recent_messages, delete_group_messages
+from app.events import current_seq, delete_group_events
+from app.progress import bucket_start, chart_data, delete_group_progress, GRANULARITIES
+from app.workload import delete_group_workload
+from app.groups.overview import groups_overview, mark_chat_read, delete_group_read_markers
 from app.utils import login_required, get_current_user
 import uuid
 
@@ -10,7 +16,7 @@ import uuid
 def groups_list():
     """Display list of all user's groups"""
     user = get_current_user()
-    groups = Group.objects(members=user).order_by('-created_at')
+    groups = groups_overview(user)
     
     return render_template('groups/groups.html', user=user, groups=groups)
 
@@ -86,7 +92,8 @@ def group_detail(group_id):
         task_subtasks = Subtask.objects(task=task).order_by('-created_at')
         subtasks.extend(task_subtasks)
     
-    chat_messages = ChatMessage.objects(group=group).order_by('timestamp').limit(100)
+    chat_messages = recent_messages(group)
+    mark_chat_read(user, group_id)
     
     is_creator = (group.created_by.id == user.id)
     
@@ -96,8 +103,36 @@ def group_detail(group_id):
                          tasks=tasks, 
                          subtasks=subtasks,
                          chat_messages=chat_messages,
+                         event_seq=current_seq(group_id),
                          is_creator=is_creator)
 
+@groups_bp.route('/group/<group_id>/progress')
+@login_required
+def group_progress(group_id):
+    """Burndown/velocity chart data for a group, one point per hour or day"""
+    user = get_current_user()
+    
+    group = Group.objects(group_id=group_id).first()
+    if not group:
+        return jsonify({'error': 'Group not found'}), 404
+    
+    if user not in group.members:
+        return jsonify({'error': 'You do not have access to this group'}), 403
+    
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in GRANULARITIES:
+        return jsonify({'error': 'granularity must be hour or day'}), 400
+    
+    periods = request.args.get('periods', 30 if granularity == 'day' else 48, type=int)
+    periods = max(1, min(periods, 366))
+    
+    # The window ends with the current (partial) bucket and holds exactly ``periods`` buckets
+    step = GRANULARITIES[granularity]
+    current = bucket_start(datetime.utcnow(), granularity)
+    start = current - step * (periods - 1)
+    end = current + step
+    return jsonify(chart_data(group_id, granularity, start, end))
+
 @groups_bp.route('/group/<group_id>/delete', methods=['POST'])
 @login_required
 def delete_group(group_id):
@@ -121,7 +156,11 @@ def delete_group(group_id):
         Subtask.objects(task=task).delete()
     tasks.delete()
     
-    ChatMessage.objects(group=group).delete()
+    delete_group_messages(group)
+    delete_group_events(group_id)
+    delete_group_progress(group_id)
+    delete_group_workload(group_id)
+    delete_group_read_markers(group_id)
     
     for member in members:
         if member.groups and group in member.groups:
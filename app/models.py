@@ -1,4 +1,8 @@
-from mongoengine import Document, StringField, ListField, ReferenceField, DateTimeField
+from mongoengine import (
+    Document, EmbeddedDocument, StringField, ListField, ReferenceField, DateTimeField,
+    IntField, BooleanField, ObjectIdField, EmbeddedDocumentField, DictField
+)
+from bson import ObjectId
 from datetime import datetime
 import bcrypt
 
@@ -56,7 +60,7 @@ class Task(Document):
     
     meta = {
         'collection': 'tasks',
-        'indexes': ['group', 'assigned_to']
+        'indexes': ['group', 'assigned_to', ('status', 'due_date')]
     }
     
     def __str__(self):
@@ -83,6 +87,7 @@ class Subtask(Document):
 class ChatMessage(Document):
     group = ReferenceField('Group', required=True)
     user = ReferenceField('User', required=True)
+    user_name = StringField(max_length=201)  # Author's display name when the message was sent
     message = StringField(required=True)
     timestamp = DateTimeField(required=True, default=datetime.utcnow)
     
@@ -91,6 +96,155 @@ class ChatMessage(Document):
         'indexes': ['group', 'timestamp']
     }
     
+    def author_name(self):
+        if self.user_name:
+            return self.user_name
+        return f"{self.user.firstname} {self.user.lastname}"
+    
+    def __str__(self):
+        return f"{self.author_name()}: {self.message[:50]}"
+
+
+class BucketedMessage(EmbeddedDocument):
+    id = ObjectIdField(required=True, default=ObjectId)
+    user = ReferenceField('User', required=True)
+    user_name = StringField(max_length=201)
+    message = StringField(required=True)
+    timestamp = DateTimeField(required=True, default=datetime.utcnow)
+
+    def author_name(self):
+        if self.user_name:
+            return self.user_name
+        return f"{self.user.firstname} {self.user.lastname}"
+
+    def __str__(self):
+        return f"{self.author_name()}: {self.message[:50]}"
+
+
+class ChatBucket(Document):
+    """A group's chat messages for one time window, packed into a single document"""
+    group = ReferenceField('Group', required=True)
+    start = DateTimeField(required=True)
+    end = DateTimeField(required=True)
+    count = IntField(required=True, default=0)
+    first_timestamp = DateTimeField()
+    last_timestamp = DateTimeField()
+    messages = ListField(EmbeddedDocumentField(BucketedMessage))
+    compacted = BooleanField(default=False)
+
+    meta = {
+        'collection': 'chat_buckets',
+        'indexes': [('group', '-start'), 'end']
+    }
+
+    def __str__(self):
+        return f"{self.group} {self.start:%Y-%m-%d %H:%M} ({self.count} messages)"
+
+
+class GroupEventSequence(Document):
+    """Per-group counter used to number events in the group event log"""
+    group_id = StringField(primary_key=True)
+    seq = IntField(required=True, default=0)
+
+    meta = {
+        'collection': 'group_event_sequences'
+    }
+
+
+class GroupEvent(Document):
+    """A Socket.IO event broadcast to a group room, kept so reconnecting clients can catch up"""
+    group_id = StringField(required=True)
+    seq = IntField(required=True)
+    event = StringField(required=True)
+    data = DictField()
+    created_at = DateTimeField(required=True, default=datetime.utcnow)
+
+    meta = {
+        'collection': 'group_events',
+        'indexes': [{'fields': ('group_id', 'seq'), 'unique': True}]
+    }
+
     def __str__(self):
-        return f"{self.user.firstname} {self.user.lastname}: {self.message[:50]}"
+        return f"{self.group_id} #{self.seq} {self.event}"
+
+
+class DueDateNotification(Document):
+    """Record of a due date notification, unique per task and kind so it is only sent once"""
+    task = ReferenceField('Task', required=True)
+    user = ReferenceField('User', required=True)
+    kind = StringField(required=True, choices=["upcoming", "overdue"])
+    due_date = DateTimeField(required=True)
+    sent_at = DateTimeField(required=True, default=datetime.utcnow)
+
+    meta = {
+        'collection': 'due_date_notifications',
+        'indexes': [{'fields': ('task', 'kind'), 'unique': True}]
+    }
+
+
+class SchedulerCheckpoint(Document):
+    """How far each scheduler scan has progressed, so restarts resume where they left off"""
+    name = StringField(primary_key=True)
+    scanned_until = DateTimeField(required=True)
+
+    meta = {
+        'collection': 'scheduler_checkpoints'
+    }
+
+
+class GroupProgress(Document):
+    """Running subtask and task totals for a group, updated on every status transition"""
+    group_id = StringField(primary_key=True)
+    subtasks_total = IntField(required=True, default=0)
+    subtasks_done = IntField(required=True, default=0)
+    tasks_completed = IntField(required=True, default=0)
+
+    meta = {
+        'collection': 'group_progress'
+    }
+
 
+class GroupProgressSnapshot(Document):
+    """Progress changes for a group within one hour or day, plus the totals at the last change"""
+    group_id = StringField(required=True)
+    granularity = StringField(required=True, choices=["hour", "day"])
+    bucket = DateTimeField(required=True)
+    created = IntField(default=0)
+    done = IntField(default=0)
+    tasks_completed = IntField(default=0)
+    remaining = IntField(default=0)
+    done_total = IntField(default=0)
+
+    meta = {
+        'collection': 'group_progress_snapshots',
+        'indexes': [{'fields': ('group_id', 'granularity', 'bucket'), 'unique': True}]
+    }
+
+
+class MemberWorkload(Document):
+    """Open tasks and subtasks assigned to a member within a group"""
+    group_id = StringField(required=True)
+    user = ReferenceField('User', required=True)
+    open_tasks = IntField(default=0)
+    open_subtasks = IntField(default=0)
+
+    meta = {
+        'collection': 'member_workloads',
+        'indexes': [{'fields': ('group_id', 'user'), 'unique': True}]
+    }
+
+    @property
+    def total(self):
+        return self.open_tasks + self.open_subtasks
+
+
+class ChatReadMarker(Document):
+    """When a user last read a group's chat, used for unread message counts"""
+    user = ReferenceField('User', required=True)
+    group_id = StringField(required=True)
+    last_read_at = DateTimeField(required=True, default=datetime.utcnow)
+
+    meta = {
+        'collection': 'chat_read_markers',
+        'indexes': [{'fields': ('user', 'group_id'), 'unique': True}]
+    }
@@ -0,0 +1,208 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from app.utils import get_socketio
+
+logger = logging.getLogger(__name__)
+
+WORKER_ID = uuid.uuid4().hex
+CHANNEL = 'presence'
+
+
+class LocalPresenceBackend:
+    """In-process stand-in for a pub/sub backend; only this worker's presence is visible"""
+
+    def __init__(self):
+        self._subscribers = []
+
+    def publish(self, message):
+        for callback in self._subscribers:
+            callback(message)
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+
+class RedisPresenceBackend:
+    """Shares presence snapshots between workers over a Redis pub/sub channel"""
+
+    def __init__(self, url):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+
+    def publish(self, message):
+        self._redis.publish(CHANNEL, json.dumps(message))
+
+    def subscribe(self, callback):
+        def listen():
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(CHANNEL)
+            for item in pubsub.listen():
+                callback(json.loads(item['data']))
+
+        get_socketio().start_background_task(listen)
+
+
+class PresenceRegistry:
+    """Connected members per group room, kept in memory and never written to the database.
+
+    Joins, leaves and heartbeats only touch local state. A flusher running
+    every ``interval`` seconds expires silent connections, shares this
+    worker's snapshot through the backend and emits one ``presence_changed``
+    diff per room that changed since the last flush.
+
+    With ``shared_emit`` (a Socket.IO message queue fans every emit out to all
+    workers' clients) each worker only reports joins and leaves of its own
+    connections, so a change is broadcast once rather than once per worker.
+    """
+
+    def __init__(self, backend, interval=5, ttl=90, shared_emit=False):
+        self.backend = backend
+        self.interval = interval
+        self.ttl = ttl
+        self.shared_emit = shared_emit
+        self._lock = threading.Lock()
+        self._rooms = {}     # room -> {sid: (user_id, name)}
+        self._seen = {}      # sid -> last heartbeat (monotonic)
+        self._remote = {}    # worker_id -> (received_at, {room: {user_id: name}})
+        self._published = {}  # room -> {user_id: name} as of the last flush
+        self._published_local = {}  # room -> {user_id: name} held by this worker at the last flush
+        self._started = False
+        backend.subscribe(self._receive)
+
+    def join(self, room, sid, user_id, name):
+        with self._lock:
+            self._rooms.setdefault(room, {})[sid] = (str(user_id), name)
+            self._seen[sid] = time.monotonic()
+
+    def leave(self, room, sid):
+        with self._lock:
+            self._remove(room, sid)
+
+    def heartbeat(self, sid):
+        with self._lock:
+            if sid in self._seen:
+                self._seen[sid] = time.monotonic()
+
+    def disconnect(self, sid):
+        with self._lock:
+            for room in list(self._rooms):
+                self._remove(room, sid)
+            self._seen.pop(sid, None)
+
+    def online(self, room):
+        """Map of user id to display name for everyone connected to the room"""
+        with self._lock:
+            return self._combined_room(room)
+
+    def _remove(self, room, sid):
+        members = self._rooms.get(room)
+        if members is None:
+            return
+        members.pop(sid, None)
+        if not members:
+            del self._rooms[room]
+        if not any(sid in m for m in self._rooms.values()):
+            self._seen.pop(sid, None)
+
+    def _local_snapshot(self):
+        return {room: dict(members.values()) for room, members in self._rooms.items()}
+
+    def _combined_room(self, room):
+        online = dict(self._rooms.get(room, {}).values())
+        for _, rooms in self._remote.values():
+            online.update(rooms.get(room, {}))
+        return online
+
+    def _receive(self, message):
+        if message.get('worker') == WORKER_ID:
+            return
+        with self._lock:
+            self._remote[message['worker']] = (time.monotonic(), message['rooms'])
+
+    def flush(self):
+        """Expire stale connections, share this worker's snapshot and emit per-room diffs"""
+        now = time.monotonic()
+        with self._lock:
+            for sid in [sid for sid, seen in self._seen.items() if now - seen > self.ttl]:
+                for room in list(self._rooms):
+                    self._remove(room, sid)
+                self._seen.pop(sid, None)
+            for worker in [w for w, (at, _) in self._remote.items() if now - at > self.interval * 3]:
+                del self._remote[worker]
+
+            snapshot = self._local_snapshot()
+            rooms = set(self._published) | set(snapshot)
+            for _, remote_rooms in self._remote.values():
+                rooms |= set(remote_rooms)
+
+            diffs = []
+            for room in rooms:
+                current = self._combined_room(room)
+                previous = self._published.get(room, {})
+                joined = {uid: name for uid, name in current.items() if uid not in previous}
+                left = [uid for uid in previous if uid not in current]
+                if self.shared_emit:
+                    owned = set(self._published_local.get(room, {})) ^ set(snapshot.get(room, {}))
+                    joined = {uid: name for uid, name in joined.items() if uid in owned}
+                    left = [uid for uid in left if uid in owned]
+                if joined or left:
+                    diffs.append((room, joined, left, list(current)))
+                if current:
+                    self._published[room] = current
+                else:
+                    self._published.pop(room, None)
+            self._published_local = snapshot
+
+        self.backend.publish({'worker': WORKER_ID, 'rooms': snapshot})
+
+        socketio = get_socketio()
+        for room, joined, left, online in diffs:
+            socketio.emit('presence_changed', {
+                'group_id': room[len('group_'):],
+                'joined': [{'user_id': uid, 'name': name} for uid, name in joined.items()],
+                'left': left,
+                'online': online,
+            }, room=room)
+
+    def start(self):
+        """Start the flusher once per worker process"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        def run():
+            socketio = get_socketio()
+            while True:
+                socketio.sleep(self.interval)
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception('Presence flush failed')
+
+        get_socketio().start_background_task(run)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_presence(app):
+    """Return this worker's presence registry, creating it from app config on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            url = app.config['PRESENCE_BACKEND_URL']
+            backend = RedisPresenceBackend(url) if url else LocalPresenceBackend()
+            _registry = PresenceRegistry(
+                backend,
+                interval=app.config['PRESENCE_BROADCAST_INTERVAL'],
+                ttl=app.config['PRESENCE_TTL'],
+                shared_emit=bool(app.config['SOCKETIO_MESSAGE_QUEUE']),
+            )
+    _registry.start()
+    return _registry
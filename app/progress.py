@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta
+from pymongo import UpdateOne
+from app.db import secondary_reads
+from app.models import Task, Subtask, GroupProgress, GroupProgressSnapshot
+
+GRANULARITIES = {
+    'hour': timedelta(hours=1),
+    'day': timedelta(days=1),
+}
+
+
+def bucket_start(timestamp, granularity):
+    if granularity == 'day':
+        return timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return timestamp.replace(minute=0, second=0, microsecond=0)
+
+
+def record_progress(group_id, created=0, done=0, tasks_completed=0, when=None):
+    """Apply subtask/task count changes to a group's totals and its hourly and daily snapshots.
+
+    ``done`` and ``tasks_completed`` are net changes and may be negative when
+    work is reopened. Costs one totals update and one bulk snapshot write.
+    """
+    if not (created or done or tasks_completed):
+        return
+
+    group_id = str(group_id)
+    when = when or datetime.utcnow()
+    totals = GroupProgress.objects(group_id=group_id).modify(
+        upsert=True,
+        new=True,
+        inc__subtasks_total=created,
+        inc__subtasks_done=done,
+        inc__tasks_completed=tasks_completed,
+    )
+
+    updates = [
+        UpdateOne(
+            {'group_id': group_id, 'granularity': granularity, 'bucket': bucket_start(when, granularity)},
+            {
+                '$inc': {'created': created, 'done': done, 'tasks_completed': tasks_completed},
+                '$set': {
+                    'remaining': totals.subtasks_total - totals.subtasks_done,
+                    'done_total': totals.subtasks_done,
+                },
+            },
+            upsert=True,
+        )
+        for granularity in GRANULARITIES
+    ]
+    GroupProgressSnapshot._get_collection().bulk_write(updates, ordered=False)
+
+
+def completion_delta(old_status, new_status, finished='done'):
+    """Net change to a finished count when an item moves from old_status to new_status"""
+    return int(new_status == finished) - int(old_status == finished)
+
+
+def chart_data(group_id, granularity, start, end):
+    """Burndown/velocity series for [start, end), one entry per bucket.
+
+    Reads only the snapshots in the window plus the latest one before it to
+    seed the totals; buckets without changes carry the previous totals.
+    """
+    group_id = str(group_id)
+    step = GRANULARITIES[granularity]
+    start = bucket_start(start, granularity)
+
+    previous = (
+        secondary_reads(GroupProgressSnapshot.objects(group_id=group_id, granularity=granularity, bucket__lt=start))
+        .order_by('-bucket')
+        .only('remaining', 'done_total')
+        .first()
+    )
+    snapshots = {
+        s.bucket: s
+        for s in secondary_reads(GroupProgressSnapshot.objects(
+            group_id=group_id, granularity=granularity, bucket__gte=start, bucket__lt=end
+        ))
+    }
+
+    remaining = previous.remaining if previous else 0
+    done_total = previous.done_total if previous else 0
+    series = {'created': [], 'done': [], 'tasks_completed': [], 'remaining': [], 'done_total': []}
+    bucket = start
+    while bucket < end:
+        snapshot = snapshots.get(bucket)
+        if snapshot:
+            remaining, done_total = snapshot.remaining, snapshot.done_total
+        series['created'].append(snapshot.created if snapshot else 0)
+        series['done'].append(snapshot.done if snapshot else 0)
+        series['tasks_completed'].append(snapshot.tasks_completed if snapshot else 0)
+        series['remaining'].append(remaining)
+        series['done_total'].append(done_total)
+        bucket += step
+
+    return dict(
+        granularity=granularity,
+        start=start.isoformat(),
+        step_seconds=int(step.total_seconds()),
+        **series
+    )
+
+
+def seed_group_progress(group):
+    """Initialise a group's totals from its current tasks and subtasks (for groups that predate snapshots)"""
+    tasks = Task.objects(group=group).only('id', 'status')
+    task_ids = [task.id for task in tasks]
+    statuses = Subtask._get_collection().aggregate([
+        {'$match': {'task': {'$in': task_ids}}},
+        {'$group': {'_id': '$status', 'count': {'$sum': 1}}},
+    ])
+    counts = {row['_id']: row['count'] for row in statuses}
+
+    GroupProgress.objects(group_id=group.group_id).update_one(
+        upsert=True,
+        set__subtasks_total=sum(counts.values()),
+        set__subtasks_done=counts.get('done', 0),
+        set__tasks_completed=sum(1 for task in tasks if task.status == 'completed'),
+    )
+
+
+def delete_group_progress(group_id):
+    GroupProgress.objects(group_id=str(group_id)).delete()
+    GroupProgressSnapshot.objects(group_id=str(group_id)).delete()
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from flask_socketio import emit
+
+
+class TokenBucket:
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def consume(self, now):
+        """Take one token; return 0 on success or the seconds until one is available"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets keyed by (event, scope, key), bounded to ``max_keys`` entries.
+
+    Buckets are kept in least-recently-used order so idle connections and
+    groups are evicted first; an evicted bucket simply starts full again.
+    """
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._by_scope = {}  # (scope, key) -> bucket keys held for it, so forget() is cheap
+        self._lock = threading.Lock()
+
+    def hit(self, key, rate, capacity):
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(rate, capacity)
+                self._by_scope.setdefault(key[1:], set()).add(key)
+                while len(self._buckets) > self.max_keys:
+                    evicted, _ = self._buckets.popitem(last=False)
+                    self._unindex(evicted)
+            else:
+                self._buckets.move_to_end(key)
+            return bucket.consume(now)
+
+    def forget(self, scope, key):
+        """Drop every bucket held for a scope key, e.g. a disconnected sid"""
+        with self._lock:
+            for bucket_key in self._by_scope.pop((scope, key), ()):
+                self._buckets.pop(bucket_key, None)
+
+    def _unindex(self, bucket_key):
+        keys = self._by_scope.get(bucket_key[1:])
+        if keys is not None:
+            keys.discard(bucket_key)
+            if not keys:
+                del self._by_scope[bucket_key[1:]]
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+limiter = RateLimiter()
+
+
+def _throttle(event, scope, key):
+    """Take a token for ``event`` from the (scope, key) bucket.
+
+    Returns None when allowed. Otherwise emits ``throttled`` to the sender
+    and returns the payload to use as the acknowledgement.
+    """
+    limits = current_app.config['SOCKET_RATE_LIMITS'].get(event, {})
+    if scope not in limits:
+        return None
+    limiter.max_keys = current_app.config['SOCKET_LIMITER_MAX_KEYS']
+    rate, capacity = limits[scope]
+    retry_after = limiter.hit((event, scope, key), rate, capacity)
+    if not retry_after:
+        return None
+
+    payload = {
+        'event': event,
+        'scope': scope,
+        'retry_after': round(retry_after, 2),
+        'message': 'Too many requests, please slow down'
+    }
+    emit('throttled', payload)
+    return dict(payload, throttled=True)
+
+
+def socket_rate_limited(event):
+    """Apply the per-connection limit configured for ``event``.
+
+    A throttled call emits ``throttled`` to the sender and returns the same
+    payload as the acknowledgement, without running the handler.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            throttled = _throttle(event, 'connection', request.sid)
+            if throttled:
+                return throttled
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+
+def group_rate_limited(event, group_id):
+    """Apply the per-group limit configured for ``event``.
+
+    Call this only after the handler has resolved the group and checked
+    membership, so clients cannot drain the bucket of a group they are not
+    in. Returns None when allowed, or the throttle acknowledgement.
+    """
+    return _throttle(event, 'group', str(group_id))
@@ -0,0 +1,124 @@
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from pymongo.errors import BulkWriteError
+from app.models import Group, Task, DueDateNotification, SchedulerCheckpoint
+from app.utils import get_socketio
+
+OPEN_STATUSES = ['pending', 'in_progress']
+DUPLICATE_KEY = 11000
+
+# Due dates are calendar days stored at midnight, so a task is overdue once its day has ended
+OVERDUE_GRACE = timedelta(days=1)
+
+_started = False
+_start_lock = threading.Lock()
+
+
+def _due_tasks(start, end):
+    """Open tasks due in [start, end), read in fixed time buckets off the (status, due_date) index"""
+    config = current_app.config
+    step = timedelta(minutes=config['DUE_DATE_BUCKET_MINUTES'])
+    bucket_start = start
+    while bucket_start < end:
+        bucket_end = min(bucket_start + step, end)
+        tasks = (
+            Task.objects(status__in=OPEN_STATUSES, due_date__gte=bucket_start, due_date__lt=bucket_end)
+            .only('id', 'title', 'assigned_to', 'group', 'due_date')
+            .no_dereference()
+            .batch_size(config['DUE_DATE_BATCH_SIZE'])
+        )
+        yield from tasks
+        bucket_start = bucket_end
+
+
+def _record_new(kind, tasks):
+    """Insert a notification record per task and return only the tasks not notified before"""
+    if not tasks:
+        return []
+
+    records = [
+        DueDateNotification(task=task.id, user=task.assigned_to.id, kind=kind, due_date=task.due_date).to_mongo()
+        for task in tasks
+    ]
+    try:
+        DueDateNotification._get_collection().insert_many(records, ordered=False)
+    except BulkWriteError as e:
+        errors = e.details.get('writeErrors', [])
+        if any(error['code'] != DUPLICATE_KEY for error in errors):
+            raise
+        already_sent = {error['index'] for error in errors}
+        return [task for index, task in enumerate(tasks) if index not in already_sent]
+    return tasks
+
+
+def _scan(kind, until, default_start):
+    """Collect tasks of one kind whose due date falls between the last checkpoint and ``until``"""
+    checkpoint = SchedulerCheckpoint.objects(name=kind).first()
+    start = checkpoint.scanned_until if checkpoint else default_start
+    if start >= until:
+        return []
+
+    tasks = _record_new(kind, list(_due_tasks(start, until)))
+    SchedulerCheckpoint.objects(name=kind).update_one(set__scanned_until=until, upsert=True)
+    return tasks
+
+
+def run_due_date_scan(now=None):
+    """Find tasks due soon or newly overdue and notify their assignees.
+
+    Each assignee gets one coalesced ``due_date_notification`` event in their
+    user room. Returns the number of tasks notified.
+    """
+    now = now or datetime.utcnow()
+    upcoming_until = now + timedelta(hours=current_app.config['DUE_DATE_UPCOMING_HOURS'])
+    overdue_until = now - OVERDUE_GRACE
+
+    # Upcoming rescans the whole (bounded) window each time, since tasks are often
+    # created or given a due date inside it; the (task, kind) records dedupe
+    upcoming = _record_new('upcoming', list(_due_tasks(overdue_until, upcoming_until)))
+    found = [('upcoming', task) for task in upcoming]
+    found += [('overdue', task) for task in _scan('overdue', overdue_until, overdue_until - OVERDUE_GRACE)]
+    if not found:
+        return 0
+
+    group_ids = {task.group.id for _, task in found}
+    groups = {g.id: g.group_id for g in Group.objects(id__in=list(group_ids)).only('id', 'group_id')}
+
+    by_user = {}
+    for kind, task in found:
+        by_user.setdefault(task.assigned_to.id, []).append({
+            'kind': kind,
+            'task_id': str(task.id),
+            'title': task.title,
+            'group_id': groups.get(task.group.id),
+            'due_date': task.due_date.strftime('%Y-%m-%d'),
+        })
+
+    socketio = get_socketio()
+    for user_id, tasks in by_user.items():
+        socketio.emit('due_date_notification', {'tasks': tasks}, room=f'user_{user_id}')
+
+    return len(found)
+
+
+def run_scheduler(app):
+    """Run due date scans forever, every DUE_DATE_SCAN_INTERVAL seconds"""
+    socketio = get_socketio()
+    while True:
+        with app.app_context():
+            try:
+                run_due_date_scan()
+            except Exception:
+                app.logger.exception('Due date scan failed')
+        socketio.sleep(app.config['DUE_DATE_SCAN_INTERVAL'])
+
+
+def start_scheduler(app):
+    """Start the in-process scheduler once per worker process"""
+    global _started
+    with _start_lock:
+        if _started:
+            return
+        _started = True
+    get_socketio().start_background_task(run_scheduler, app)
@@ -1,11 +1,24 @@
-from flask import session
+from flask import session, request, current_app
 from flask_socketio import emit, join_room, leave_room
 from app import socketio
-from app.models import User, Group, ChatMessage
-from app.utils import get_current_user
+from app.models import User, Group, Task
+from app.chat import save_message
+from app.utils import get_current_user, emit_group_event
+from app.events import current_seq, events_since
+from app.groups.overview import mark_chat_read
+from app.presence import get_presence
+from app.ratelimit import limiter, socket_rate_limited, group_rate_limited
 from datetime import datetime
 
+@socketio.on('connect')
+def handle_connect():
+    """Join the user's personal room for notifications addressed to them"""
+    user = get_current_user()
+    if user:
+        join_room(f'user_{user.id}')
+
 @socketio.on('join_group')
+@socket_rate_limited('join_group')
 def handle_join_group(data):
     """Handle client joining a group's SocketIO room"""
     group_id = data.get('group_id')
@@ -28,11 +41,55 @@ def handle_join_group(data):
         emit('error', {'message': 'You are not a member of this group'})
         return
     
+    throttled = group_rate_limited('join_group', group_id)
+    if throttled:
+        return throttled
+    
     room = f'group_{group_id}'
     join_room(room)
-    emit('joined_group', {'group_id': group_id, 'message': f'Joined group {group.name}'})
+    presence = get_presence(current_app._get_current_object())
+    presence.join(room, request.sid, user.id, f'{user.firstname} {user.lastname}')
+    online = list(presence.online(room))
+    
+    since = data.get('since')
+    if since is None:
+        emit('joined_group', {
+            'group_id': group_id,
+            'message': f'Joined group {group.name}',
+            'seq': current_seq(group_id),
+            'online': online
+        })
+        return
+    
+    try:
+        since = int(since)
+    except (TypeError, ValueError):
+        emit('error', {'message': 'since must be a sequence number'})
+        return
+    
+    events = events_since(group_id, since)
+    if events is None:
+        # Too far behind to replay; the client should reload its snapshot
+        tasks = Task.objects(group=group).only('id', 'status')
+        emit('group_snapshot', {
+            'group_id': group_id,
+            'seq': current_seq(group_id),
+            'tasks': [{'task_id': str(task.id), 'status': task.status} for task in tasks]
+        })
+        return
+    
+    for event in events:
+        emit(event.event, dict(event.data, seq=event.seq))
+    emit('joined_group', {
+        'group_id': group_id,
+        'message': f'Joined group {group.name}',
+        'seq': events[-1].seq if events else since,
+        'replayed': len(events),
+        'online': online
+    })
 
 @socketio.on('leave_group')
+@socket_rate_limited('leave_group')
 def handle_leave_group(data):
     """Handle client leaving a group's SocketIO room"""
     group_id = data.get('group_id')
@@ -43,9 +100,16 @@ def handle_leave_group(data):
     
     room = f'group_{group_id}'
     leave_room(room)
+    get_presence(current_app._get_current_object()).leave(room, request.sid)
+    
+    # Leaving the page means everything shown so far has been read
+    user = get_current_user()
+    if user:
+        mark_chat_read(user, group_id)
     emit('left_group', {'group_id': group_id, 'message': 'Left group'})
 
 @socketio.on('send_message')
+@socket_rate_limited('send_message')
 def handle_send_message(data):
     """Handle client sending a chat message"""
     group_id = data.get('group_id')
@@ -59,6 +123,11 @@ def handle_send_message(data):
         emit('error', {'message': 'Message cannot be empty'})
         return
     
+    max_length = current_app.config['CHAT_MAX_MESSAGE_LENGTH']
+    if len(message_text) > max_length:
+        emit('error', {'message': f'Message cannot be longer than {max_length} characters'})
+        return
+    
     user = get_current_user()
     if not user:
         emit('error', {'message': 'Authentication required'})
@@ -73,21 +142,27 @@ def handle_send_message(data):
         emit('error', {'message': 'You are not a member of this group'})
         return
     
-    chat_message = ChatMessage(
-        group=group,
-        user=user,
-        message=message_text,
-        timestamp=datetime.utcnow()
-    )
-    chat_message.save()
+    throttled = group_rate_limited('send_message', group_id)
+    if throttled:
+        return throttled
     
-    room = f'group_{group_id}'
-    emit('message_received', {
+    chat_message = save_message(group, user, message_text, datetime.utcnow())
+    
+    emit_group_event(group_id, 'message_received', {
         'message_id': str(chat_message.id),
         'user_id': str(user.id),
-        'user_name': f'{user.firstname} {user.lastname}',
+        'user_name': chat_message.user_name,
         'message': message_text,
         'timestamp': chat_message.timestamp.isoformat()
-    }, room=room)
+    })
 
+@socketio.on('disconnect')
+def handle_disconnect():
+    """Release the rate limiter and presence state held for this connection"""
+    limiter.forget('connection', request.sid)
+    get_presence(current_app._get_current_object()).disconnect(request.sid)
 
+@socketio.on('presence_heartbeat')
+def handle_presence_heartbeat(data=None):
+    """Keep this connection's presence alive; only touches in-memory state"""
+    get_presence(current_app._get_current_object()).heartbeat(request.sid)
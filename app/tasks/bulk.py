@@ -0,0 +1,272 @@
+import csv
+import io
+import json
+from datetime import datetime
+from bson import ObjectId
+from mongoengine.errors import ValidationError
+from app.models import User, Group, Task, Subtask
+from app.utils import emit_progress_update, emit_task_status_update
+from app.progress import record_progress, completion_delta
+from app.workload import record_workload
+
+SUBTASK_STATUSES = ['not_started', 'in_progress', 'done']
+TITLE_MAX_LENGTH = Task.title.max_length
+
+class PlanError(Exception):
+    """Raised when an import plan cannot be parsed or fails validation"""
+
+    def __init__(self, errors):
+        self.errors = errors if isinstance(errors, list) else [errors]
+        super().__init__('; '.join(self.errors))
+
+
+def rollup_task_status(subtask_statuses, default='pending'):
+    """Derive a task status from the statuses of its subtasks"""
+    if not subtask_statuses:
+        return default
+    if all(status == 'done' for status in subtask_statuses):
+        return 'completed'
+    if all(status == 'not_started' for status in subtask_statuses):
+        return 'pending'
+    return 'in_progress'
+
+
+def parse_plan(raw, fmt):
+    """Parse a JSON or CSV plan into a list of task dicts with nested subtasks"""
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8-sig')
+
+    if fmt == 'json':
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise PlanError(f'Invalid JSON: {e}')
+        tasks = data.get('tasks') if isinstance(data, dict) else data
+        if not isinstance(tasks, list):
+            raise PlanError('JSON plan must be a list of tasks or an object with a "tasks" list')
+        return tasks
+
+    if fmt == 'csv':
+        reader = csv.DictReader(io.StringIO(raw))
+        missing = [c for c in ('group_id', 'task_title', 'assigned_to') if c not in (reader.fieldnames or [])]
+        if missing:
+            raise PlanError(f'CSV plan is missing columns: {", ".join(missing)}')
+
+        # Rows sharing (group_id, task_title) describe the same task, one subtask per row
+        tasks = {}
+        for row in reader:
+            key = (row['group_id'].strip(), row['task_title'].strip())
+            task = tasks.get(key)
+            if task is None:
+                task = tasks[key] = {
+                    'group_id': key[0],
+                    'title': key[1],
+                    'description': (row.get('task_description') or '').strip(),
+                    'assigned_to': row['assigned_to'].strip(),
+                    'due_date': (row.get('due_date') or '').strip() or None,
+                    'subtasks': [],
+                }
+            if (row.get('subtask_title') or '').strip():
+                task['subtasks'].append({
+                    'title': row['subtask_title'].strip(),
+                    'description': (row.get('subtask_description') or '').strip(),
+                    'status': (row.get('subtask_status') or '').strip() or 'not_started',
+                })
+        return list(tasks.values())
+
+    raise PlanError(f'Unsupported plan format: {fmt}')
+
+
+def import_plan(plan, created_by, require_membership=True):
+    """Validate and insert a plan of tasks and subtasks across groups.
+
+    Groups and assignees are resolved with one query each, tasks and
+    subtasks are written with one bulk insert each, and every affected
+    group receives a single progress update.
+    """
+    errors = []
+
+    group_ids = {str(t.get('group_id', '')).strip() for t in plan if isinstance(t, dict)}
+    emails = {str(t.get('assigned_to', '')).strip() for t in plan if isinstance(t, dict)}
+
+    groups = {g.group_id: g for g in Group.objects(group_id__in=list(group_ids)).no_dereference()}
+    users = {u.email: u for u in User.objects(email__in=list(emails)).only('id', 'email')}
+    members = {gid: {ref.id for ref in g.members} for gid, g in groups.items()}
+
+    tasks = []
+    subtasks = []
+    for index, item in enumerate(plan, start=1):
+        label = f'Task {index}'
+        reported = len(errors)
+        if not isinstance(item, dict):
+            errors.append(f'{label}: expected an object')
+            continue
+
+        title = str(item.get('title', '')).strip()
+        group_id = str(item.get('group_id', '')).strip()
+        email = str(item.get('assigned_to', '')).strip()
+
+        if not title:
+            errors.append(f'{label}: title is required')
+        elif len(title) > TITLE_MAX_LENGTH:
+            errors.append(f'{label}: title cannot be longer than {TITLE_MAX_LENGTH} characters')
+        group = groups.get(group_id)
+        if not group:
+            errors.append(f'{label}: group {group_id} not found')
+            continue
+        if require_membership and created_by.id not in members[group_id]:
+            errors.append(f'{label}: you do not have access to group {group_id}')
+            continue
+        assignee = users.get(email)
+        if not assignee:
+            errors.append(f'{label}: user {email} not found')
+            continue
+        if assignee.id not in members[group_id]:
+            errors.append(f'{label}: {email} is not a member of group {group_id}')
+            continue
+
+        due_date = None
+        if item.get('due_date'):
+            try:
+                due_date = datetime.strptime(str(item['due_date']), '%Y-%m-%d')
+            except ValueError:
+                errors.append(f'{label}: due_date must be YYYY-MM-DD')
+                continue
+
+        subtask_items = item.get('subtasks') or []
+        if not isinstance(subtask_items, list):
+            errors.append(f'{label}: subtasks must be a list')
+            continue
+        statuses = []
+        for sub_index, sub in enumerate(subtask_items, start=1):
+            if not isinstance(sub, dict):
+                errors.append(f'{label}, subtask {sub_index}: expected an object')
+                continue
+            status = sub.get('status') or 'not_started'
+            sub_title = str(sub.get('title', '')).strip()
+            if not sub_title:
+                errors.append(f'{label}, subtask {sub_index}: title is required')
+            elif len(sub_title) > TITLE_MAX_LENGTH:
+                errors.append(
+                    f'{label}, subtask {sub_index}: title cannot be longer than {TITLE_MAX_LENGTH} characters'
+                )
+            if status not in SUBTASK_STATUSES:
+                errors.append(f'{label}, subtask {sub_index}: invalid status {status}')
+            statuses.append(status)
+        if len(errors) > reported:
+            continue
+
+        # Ids are assigned up front so subtasks can reference, and be validated against, their task
+        task = Task(
+            id=ObjectId(),
+            title=title,
+            description=item.get('description') or "",
+            assigned_to=assignee,
+            group=group,
+            created_by=created_by,
+            due_date=due_date,
+            status=rollup_task_status(statuses),
+        )
+        task_subtasks = [
+            Subtask(
+                title=str(sub['title']).strip(),
+                description=sub.get('description') or "",
+                task=task,
+                assigned_to=assignee,
+                status=sub.get('status') or 'not_started',
+            )
+            for sub in subtask_items
+        ]
+
+        # Catch anything the checks above missed before writing, so nothing is half-imported
+        documents = [(label, task)]
+        documents += [(f'{label}, subtask {i}', subtask) for i, subtask in enumerate(task_subtasks, start=1)]
+        for document_label, document in documents:
+            try:
+                document.validate()
+            except ValidationError as e:
+                errors.append(f'{document_label}: {e}')
+        tasks.append(task)
+        subtasks.extend(task_subtasks)
+
+    if errors:
+        raise PlanError(errors)
+    if not tasks:
+        return {'tasks_created': 0, 'subtasks_created': 0, 'groups': []}
+
+    Task.objects.insert(tasks, load_bulk=False)
+    if subtasks:
+        Subtask.objects.insert(subtasks, load_bulk=False)
+
+    progress = {}
+    workload = {}
+    for task in tasks:
+        counts = progress.setdefault(task.group.group_id, {'created': 0, 'done': 0, 'tasks_completed': 0})
+        counts['tasks_completed'] += int(task.status == 'completed')
+        load = workload.setdefault((task.group.group_id, task.assigned_to.id), {'open_tasks': 0, 'open_subtasks': 0})
+        load['open_tasks'] += int(task.status != 'completed')
+    for subtask in subtasks:
+        counts = progress[subtask.task.group.group_id]
+        counts['created'] += 1
+        counts['done'] += int(subtask.status == 'done')
+        load = workload[(subtask.task.group.group_id, subtask.assigned_to.id)]
+        load['open_subtasks'] += int(subtask.status != 'done')
+
+    for (group_id, user_id), load in workload.items():
+        record_workload(group_id, user_id, **load)
+
+    touched = sorted(progress)
+    for group_id in touched:
+        record_progress(group_id, **progress[group_id])
+        emit_progress_update(group_id)
+
+    return {
+        'tasks_created': len(tasks),
+        'subtasks_created': len(subtasks),
+        'groups': touched,
+    }
+
+
+def set_subtask_statuses(task, status, subtask_ids=None, task_status=None):
+    """Set the status of a task's subtasks in one update and roll it up to the task.
+
+    When ``subtask_ids`` is given only those subtasks are touched. The task
+    status is derived from the remaining subtask statuses unless
+    ``task_status`` forces a value. Returns the number of subtask and task
+    documents that actually changed.
+    """
+    query = Subtask.objects(task=task, status__ne=status)
+    if subtask_ids is not None:
+        query = query.filter(id__in=list(subtask_ids))
+    # Moving work out of 'done' lowers the group's done count, so count those first
+    reopened = query.filter(status='done').count() if status != 'done' else 0
+    subtasks_updated = query.update(status=status)
+
+    if task_status is None:
+        task_status = rollup_task_status(Subtask.objects(task=task).distinct('status'), default=task.status)
+
+    tasks_updated = 0
+    previous_status = task.status
+    if task_status != task.status:
+        tasks_updated = Task.objects(id=task.id, status__ne=task_status).update(set__status=task_status)
+        task.status = task_status
+
+    done = subtasks_updated if status == 'done' else -reopened
+    tasks_completed = completion_delta(previous_status, task.status, 'completed') if tasks_updated else 0
+    record_progress(task.group.group_id, done=done, tasks_completed=tasks_completed)
+    record_workload(task.group.group_id, task.assigned_to.id, open_tasks=-tasks_completed, open_subtasks=-done)
+
+    return subtasks_updated, tasks_updated
+
+
+def reopen_completed_task(task):
+    """Move a completed task back to in_progress, adjusting counters and notifying only
+    if this call made the change (another request may already have reopened it)"""
+    if not Task.objects(id=task.id, status='completed').update_one(set__status='in_progress'):
+        return False
+
+    task.status = 'in_progress'
+    record_progress(task.group.group_id, tasks_completed=-1)
+    record_workload(task.group.group_id, task.assigned_to.id, open_tasks=1)
+    emit_task_status_update(str(task.group.group_id), str(task.id))
+    return True
@@ -1,8 +1,13 @@
 from flask import render_template, redirect, url_for, flash, request, jsonify
+from bson import ObjectId
 from app.tasks import tasks_bp
 from app.forms import AssignTaskForm, CreateSubtaskForm
 from app.models import User, Group, Task, Subtask
 from app.utils import login_required, get_current_user, emit_progress_update, emit_task_status_update
+from app.events import current_seq
+from app.progress import record_progress, completion_delta
+from app.workload import record_workload, group_workloads
+from app.tasks.bulk import PlanError, parse_plan, import_plan, set_subtask_statuses, reopen_completed_task, SUBTASK_STATUSES
 
 @tasks_bp.route('/assign_task/<group_id>', methods=['GET', 'POST'])
 @login_required
@@ -21,7 +26,16 @@ def assign_task(group_id):
     
     form = AssignTaskForm()
     
-    form.assign_to.choices = [(str(member.id), f'{member.firstname} {member.lastname}') for member in group.members]
+    # Least-loaded members first, labelled with their open work in this group
+    workloads = group_workloads(group_id)
+    members = sorted(group.members, key=lambda m: (workloads[m.id].total if m.id in workloads else 0, m.firstname, m.lastname))
+    form.assign_to.choices = []
+    for member in members:
+        workload = workloads.get(member.id)
+        open_tasks = workload.open_tasks if workload else 0
+        open_subtasks = workload.open_subtasks if workload else 0
+        label = f'{member.firstname} {member.lastname} ({open_tasks} open tasks, {open_subtasks} open subtasks)'
+        form.assign_to.choices.append((str(member.id), label))
     
     if form.validate_on_submit():
         assigned_user = User.objects(id=form.assign_to.data).first()
@@ -39,6 +53,7 @@ def assign_task(group_id):
             due_date=form.due_date.data if form.due_date.data else None
         )
         task.save()
+        record_workload(group_id, assigned_user.id, open_tasks=1)
         
         flash(f'Task "{task.title}" assigned to {assigned_user.firstname} {assigned_user.lastname} successfully!', 'success')
         return redirect(url_for('tasks.task_detail', task_id=str(task.id)))
@@ -65,9 +80,7 @@ def task_detail(task_id):
     if task.status == 'completed' and subtasks.count() > 0:
         all_done = all(subtask.status == 'done' for subtask in subtasks)
         if not all_done:
-            task.status = 'in_progress'
-            task.save()
-            emit_task_status_update(str(task.group.group_id), str(task.id))
+            reopen_completed_task(task)
     
     is_assignee = (task.assigned_to.id == user.id)
     
@@ -75,6 +88,7 @@ def task_detail(task_id):
                          user=user,
                          task=task, 
                          subtasks=subtasks,
+                         event_seq=current_seq(task.group.group_id),
                          is_assignee=is_assignee)
 
 @tasks_bp.route('/create_subtask/<task_id>', methods=['GET', 'POST'])
@@ -108,6 +122,7 @@ def create_subtask(task_id):
         subtask.save()
         
         task = Task.objects(id=task_id).first()
+        previous_status = task.status
         
         all_subtasks = Subtask.objects(task=task)
         all_done = False
@@ -129,6 +144,17 @@ def create_subtask(task_id):
             task.status = 'in_progress'
         
         task.save()
+        record_progress(
+            task.group.group_id,
+            created=1,
+            tasks_completed=completion_delta(previous_status, task.status, 'completed')
+        )
+        record_workload(
+            task.group.group_id,
+            task.assigned_to.id,
+            open_tasks=-completion_delta(previous_status, task.status, 'completed'),
+            open_subtasks=1
+        )
         emit_task_status_update(str(task.group.group_id), str(task.id))
         emit_progress_update(str(task.group.group_id), str(task.id))
         
@@ -157,10 +183,12 @@ def update_subtask_status(subtask_id):
     if new_status not in ['not_started', 'in_progress', 'done']:
         return jsonify({'error': 'Invalid status'}), 400
     
+    previous_subtask_status = subtask.status
     subtask.status = new_status
     subtask.save()
     
     task = Task.objects(id=subtask.task.id).first()
+    previous_task_status = task.status
     task_status_changed = False
     
     all_subtasks = Subtask.objects(task=task)
@@ -203,6 +231,17 @@ def update_subtask_status(subtask_id):
             task_status_changed = True
             emit_task_status_update(str(task.group.group_id), str(task.id))
     
+    record_progress(
+        task.group.group_id,
+        done=completion_delta(previous_subtask_status, new_status),
+        tasks_completed=completion_delta(previous_task_status, task.status, 'completed')
+    )
+    record_workload(
+        task.group.group_id,
+        task.assigned_to.id,
+        open_tasks=-completion_delta(previous_task_status, task.status, 'completed'),
+        open_subtasks=-completion_delta(previous_subtask_status, new_status)
+    )
     emit_progress_update(str(task.group.group_id), str(task.id))
     
     return jsonify({
@@ -233,18 +272,83 @@ def complete_task(task_id):
         flash('Only the task assignee can complete this task.', 'error')
         return redirect(url_for('tasks.task_detail', task_id=task_id))
     
-    task.status = 'completed'
-    task.save()
-    
-    subtasks = Subtask.objects(task=task)
-    for subtask in subtasks:
-        if subtask.status != 'done':
-            subtask.status = 'done'
-            subtask.save()
+    subtasks_updated, tasks_updated = set_subtask_statuses(task, 'done', task_status='completed')
     
     emit_task_status_update(str(task.group.group_id), str(task.id))
     emit_progress_update(str(task.group.group_id), str(task.id))
     
-    flash(f'Task "{task.title}" marked as completed! All subtasks have been marked as done.', 'success')
+    if request.is_json:
+        return jsonify({
+            'success': True,
+            'task_status': task.status,
+            'subtasks_updated': subtasks_updated,
+            'tasks_updated': tasks_updated
+        })
+    
+    flash(f'Task "{task.title}" marked as completed! {subtasks_updated} subtask(s) were marked as done.', 'success')
     return redirect(url_for('tasks.task_detail', task_id=task_id))
 
+@tasks_bp.route('/task/<task_id>/subtasks/bulk_status', methods=['POST'])
+@login_required
+def bulk_update_subtask_status(task_id):
+    """Set the status of all (or a chosen set of) a task's subtasks at once"""
+    user = get_current_user()
+    
+    task = Task.objects(id=task_id).first()
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    if user not in task.group.members:
+        return jsonify({'error': 'You do not have access to this task'}), 403
+    
+    if task.assigned_to.id != user.id:
+        return jsonify({'error': 'Only the task assignee can update subtask status'}), 403
+    
+    data = request.get_json(silent=True) or {}
+    new_status = data.get('status')
+    if new_status not in SUBTASK_STATUSES:
+        return jsonify({'error': 'Invalid status'}), 400
+    
+    subtask_ids = data.get('subtask_ids')
+    if subtask_ids is not None:
+        if not isinstance(subtask_ids, list) or not all(ObjectId.is_valid(str(i)) for i in subtask_ids):
+            return jsonify({'error': 'subtask_ids must be a list of subtask ids'}), 400
+    
+    previous_status = task.status
+    subtasks_updated, tasks_updated = set_subtask_statuses(task, new_status, subtask_ids)
+    
+    if tasks_updated:
+        emit_task_status_update(str(task.group.group_id), str(task.id))
+    if subtasks_updated:
+        emit_progress_update(str(task.group.group_id), str(task.id))
+    
+    return jsonify({
+        'success': True,
+        'status': new_status,
+        'subtasks_updated': subtasks_updated,
+        'tasks_updated': tasks_updated,
+        'task_status': task.status,
+        'task_status_changed': task.status != previous_status
+    })
+
+@tasks_bp.route('/tasks/bulk_import', methods=['POST'])
+@login_required
+def bulk_import():
+    """Create tasks and subtasks across groups from an uploaded CSV/JSON plan"""
+    user = get_current_user()
+
+    upload = request.files.get('plan')
+    try:
+        if upload:
+            fmt = 'csv' if upload.filename.lower().endswith('.csv') else 'json'
+            plan = parse_plan(upload.read(), fmt)
+        elif request.is_json:
+            plan = parse_plan(request.get_data(), 'json')
+        else:
+            return jsonify({'error': 'Upload a CSV/JSON file as "plan" or post a JSON body'}), 400
+
+        result = import_plan(plan, user)
+    except PlanError as e:
+        return jsonify({'error': 'Invalid plan', 'details': e.errors}), 400
+
+    return jsonify(dict(success=True, **result))
@@ -26,28 +26,35 @@ def get_current_user():
         return None
 
 
-def emit_progress_update(group_id, task_id=None):
+def emit_group_event(group_id, event, data, broadcast=False):
+    """Record an event in the group's event log and emit it to the group room.
+
+    The payload carries the event's ``seq`` so clients can ask for a replay
+    of anything they missed when they rejoin. With ``broadcast`` the event
+    is also sent to every connected client (used by the dashboard).
+    """
+    from app.events import record_event
+
     socketio = get_socketio()
-    socketio.emit(
-        'subtask_status_changed',
-        {'group_id': str(group_id), 'task_id': str(task_id) if task_id else None},
-        room=f'group_{group_id}',
-    )
-    socketio.emit(
+    payload = dict(data, seq=record_event(group_id, event, data))
+    socketio.emit(event, payload, room=f'group_{group_id}')
+    if broadcast:
+        socketio.emit(event, payload)
+
+
+def emit_progress_update(group_id, task_id=None):
+    emit_group_event(
+        group_id,
         'subtask_status_changed',
         {'group_id': str(group_id), 'task_id': str(task_id) if task_id else None},
+        broadcast=True,
     )
 
 
 def emit_task_status_update(group_id, task_id):
-    socketio = get_socketio()
-    socketio.emit(
+    emit_group_event(
+        group_id,
         'task_status_changed',
         {'group_id': str(group_id), 'task_id': str(task_id)},
-        room=f'group_{group_id}',
+        broadcast=True,
     )
-    socketio.emit(
-        'task_status_changed',
-        {'group_id': str(group_id), 'task_id': str(task_id)},
-    )
-
@@ -0,0 +1,44 @@
+from app.models import Task, Subtask, MemberWorkload
+
+
+def record_workload(group_id, user_id, open_tasks=0, open_subtasks=0):
+    """Adjust a member's open task/subtask counts in a group"""
+    if not (open_tasks or open_subtasks):
+        return
+    MemberWorkload.objects(group_id=str(group_id), user=user_id).update_one(
+        upsert=True,
+        inc__open_tasks=open_tasks,
+        inc__open_subtasks=open_subtasks,
+    )
+
+
+def group_workloads(group_id):
+    """Map of user id to MemberWorkload for every member with recorded work in the group"""
+    return {w.user.id: w for w in MemberWorkload.objects(group_id=str(group_id)).no_dereference()}
+
+
+def rebuild_group_workload(group):
+    """Recompute a group's workload index from its tasks and subtasks"""
+    tasks = list(Task.objects(group=group).only('id', 'status', 'assigned_to').no_dereference())
+    counts = {}
+    for task in tasks:
+        if task.status != 'completed':
+            counts.setdefault(task.assigned_to.id, [0, 0])[0] += 1
+
+    open_subtasks = Subtask._get_collection().aggregate([
+        {'$match': {'task': {'$in': [task.id for task in tasks]}, 'status': {'$ne': 'done'}}},
+        {'$group': {'_id': '$assigned_to', 'count': {'$sum': 1}}},
+    ])
+    for row in open_subtasks:
+        counts.setdefault(row['_id'], [0, 0])[1] = row['count']
+
+    MemberWorkload.objects(group_id=group.group_id).delete()
+    if counts:
+        MemberWorkload.objects.insert([
+            MemberWorkload(group_id=group.group_id, user=user_id, open_tasks=t, open_subtasks=s)
+            for user_id, (t, s) in counts.items()
+        ], load_bulk=False)
+
+
+def delete_group_workload(group_id):
+    MemberWorkload.objects(group_id=str(group_id)).delete()
@@ -0,0 +1,73 @@
+"""Compare bytes and encode CPU per broadcast for the JSON and msgpack Socket.IO serializers.
+
+Payloads carry ids and timestamps as strings under both serializers, so
+msgpack saves only a few bytes per packet (and can come out larger once
+deflated); measure before switching SOCKETIO_SERIALIZER.
+
+Run from the project root:
+
+    python benchmarks/socketio_serialization.py
+"""
+import time
+import zlib
+from datetime import datetime
+from bson import ObjectId
+from socketio.packet import Packet
+from socketio.msgpack_packet import MsgPackPacket
+
+ROUNDS = 20000
+
+PAYLOADS = {
+    'message_received': {
+        'message_id': str(ObjectId()),
+        'user_id': str(ObjectId()),
+        'user_name': 'Ada Lovelace',
+        'message': 'Pushed the draft of section 3, can someone review the figures before Friday?',
+        'timestamp': datetime.utcnow().isoformat(),
+        'seq': 1842,
+    },
+    'task_status_changed': {
+        'group_id': '3f1c2b9e-8c1d-4b7a-9a51-6f0f2f5d0c11',
+        'task_id': str(ObjectId()),
+        'seq': 1843,
+    },
+    'group_snapshot': {
+        'group_id': '3f1c2b9e-8c1d-4b7a-9a51-6f0f2f5d0c11',
+        'seq': 1844,
+        'tasks': [{'task_id': str(ObjectId()), 'status': 'in_progress'} for _ in range(50)],
+    },
+}
+
+
+def encoded_size(encoded):
+    if isinstance(encoded, list):
+        return sum(encoded_size(part) for part in encoded)
+    return len(encoded.encode('utf-8') if isinstance(encoded, str) else encoded)
+
+
+def encoded_bytes(encoded):
+    if isinstance(encoded, list):
+        return b''.join(encoded_bytes(part) for part in encoded)
+    return encoded.encode('utf-8') if isinstance(encoded, str) else encoded
+
+
+def bench(packet_class, event, payload):
+    packet = packet_class(data=[event, payload], namespace='/')
+    encoded = packet.encode()
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        packet_class(data=[event, payload], namespace='/').encode()
+    elapsed = time.perf_counter() - start
+    return encoded_size(encoded), len(zlib.compress(encoded_bytes(encoded))), elapsed / ROUNDS * 1e6
+
+
+def main():
+    print(f"{'event':<22}{'format':<10}{'bytes':>8}{'deflated':>10}{'us/encode':>11}")
+    for event, payload in PAYLOADS.items():
+        for name, packet_class in (('json', Packet), ('msgpack', MsgPackPacket)):
+            size, deflated, micros = bench(packet_class, event, payload)
+            print(f'{event:<22}{name:<10}{size:>8}{deflated:>10}{micros:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
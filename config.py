@@ -9,4 +9,63 @@ class Config:
         'db': os.environ.get('MONGODB_DB') or 'group_project_manager',
         'host': os.environ.get('MONGODB_URI') or 'mongodb://localhost:27017/group_project_manager'
     }
-
+    # Chat storage: 'document' keeps one document per message, 'bucket' packs
+    # messages into per-group time-window documents (see app/chat.py)
+    CHAT_STORAGE = os.environ.get('CHAT_STORAGE') or 'document'
+    CHAT_BUCKET_MINUTES = int(os.environ.get('CHAT_BUCKET_MINUTES') or 60)
+    CHAT_BUCKET_SIZE = int(os.environ.get('CHAT_BUCKET_SIZE') or 200)
+    CHAT_COMPACT_BUCKET_SIZE = int(os.environ.get('CHAT_COMPACT_BUCKET_SIZE') or 2000)
+    CHAT_HISTORY_LIMIT = 100
+    # Number of events kept per group for reconnect catch-up, and the largest
+    # gap replayed before a client is told to resync from a snapshot instead
+    EVENT_LOG_SIZE = int(os.environ.get('EVENT_LOG_SIZE') or 500)
+    EVENT_REPLAY_LIMIT = int(os.environ.get('EVENT_REPLAY_LIMIT') or 200)
+    # Socket.IO limits. Each entry is (tokens per second, burst size) for a
+    # token bucket kept per connection and, once membership is checked, per
+    # group; the limiter keeps at most SOCKET_LIMITER_MAX_KEYS buckets and
+    # evicts the least recently used.
+    SOCKET_RATE_LIMITS = {
+        'send_message': {'connection': (1.0, 5), 'group': (10.0, 30)},
+        'join_group': {'connection': (0.5, 5), 'group': (5.0, 50)},
+        'leave_group': {'connection': (0.5, 5)},
+    }
+    SOCKET_LIMITER_MAX_KEYS = int(os.environ.get('SOCKET_LIMITER_MAX_KEYS') or 10000)
+    CHAT_MAX_MESSAGE_LENGTH = int(os.environ.get('CHAT_MAX_MESSAGE_LENGTH') or 2000)
+    # Socket.IO wire format: 'json' (default) or 'msgpack' for binary packets.
+    # Templates load the matching client build.
+    SOCKETIO_SERIALIZER = os.environ.get('SOCKETIO_SERIALIZER') or 'json'
+    # Due date notifications. The in-process scheduler can be disabled when
+    # running worker.py instead; a message queue (e.g. redis://) lets a
+    # separate worker process emit to browsers connected to the web workers.
+    DUE_DATE_SCHEDULER_ENABLED = (os.environ.get('DUE_DATE_SCHEDULER_ENABLED') or 'true').lower() == 'true'
+    DUE_DATE_SCAN_INTERVAL = int(os.environ.get('DUE_DATE_SCAN_INTERVAL') or 300)
+    DUE_DATE_UPCOMING_HOURS = int(os.environ.get('DUE_DATE_UPCOMING_HOURS') or 24)
+    DUE_DATE_BUCKET_MINUTES = 60
+    DUE_DATE_BATCH_SIZE = 500
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    # Online presence is tracked in memory per worker and broadcast as diffs
+    # every PRESENCE_BROADCAST_INTERVAL seconds. Set PRESENCE_BACKEND_URL to a
+    # redis:// URL to share presence between workers.
+    PRESENCE_BACKEND_URL = os.environ.get('PRESENCE_BACKEND_URL')
+    PRESENCE_BROADCAST_INTERVAL = int(os.environ.get('PRESENCE_BROADCAST_INTERVAL') or 5)
+    PRESENCE_TTL = int(os.environ.get('PRESENCE_TTL') or 90)
+    # MongoDB connection pool, timeouts and wire compression ('zstd,snappy'
+    # needs the zstandard / python-snappy packages). For a local single-node
+    # replica set use MONGODB_URI=mongodb://localhost:27017/?replicaSet=rs0
+    # and MONGODB_TLS=false.
+    MONGODB_MAX_POOL_SIZE = int(os.environ.get('MONGODB_MAX_POOL_SIZE') or 100)
+    MONGODB_MIN_POOL_SIZE = int(os.environ.get('MONGODB_MIN_POOL_SIZE') or 0)
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS = int(os.environ.get('MONGODB_WAIT_QUEUE_TIMEOUT_MS') or 5000)
+    MONGODB_CONNECT_TIMEOUT_MS = int(os.environ.get('MONGODB_CONNECT_TIMEOUT_MS') or 10000)
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS = int(os.environ.get('MONGODB_SERVER_SELECTION_TIMEOUT_MS') or 10000)
+    MONGODB_SOCKET_TIMEOUT_MS = int(os.environ.get('MONGODB_SOCKET_TIMEOUT_MS') or 30000)
+    MONGODB_COMPRESSORS = os.environ.get('MONGODB_COMPRESSORS') or ''
+    MONGODB_TLS = (os.environ.get('MONGODB_TLS') or 'true').lower() == 'true'
+    MONGODB_TLS_ALLOW_INVALID_CERTIFICATES = (os.environ.get('MONGODB_TLS_ALLOW_INVALID_CERTIFICATES') or 'true').lower() == 'true'
+    # Read-heavy views (dashboard, groups list, chat history, progress charts)
+    # may read from secondaries at most this many seconds behind (minimum 90).
+    # Writes and authorization checks always use the primary.
+    MONGODB_SECONDARY_READS = (os.environ.get('MONGODB_SECONDARY_READS') or 'false').lower() == 'true'
+    MONGODB_MAX_STALENESS_SECONDS = int(os.environ.get('MONGODB_MAX_STALENESS_SECONDS') or 90)
+    # Expose /metrics (MongoDB pool wait time) for scraping
+    METRICS_ENABLED = (os.environ.get('METRICS_ENABLED') or 'false').lower() == 'true'
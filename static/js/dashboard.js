@@ -0,0 +1,32 @@
+// Set progress bar colors based on progress value
+document.addEventListener('DOMContentLoaded', function() {
+    const progressBars = document.querySelectorAll('.progress-bar');
+    progressBars.forEach(function(bar) {
+        const progress = parseFloat(bar.getAttribute('data-progress'));
+        bar.classList.remove('progress-low', 'progress-medium', 'progress-high');
+        
+        if (progress <= 33) {
+            bar.classList.add('progress-low');
+        } else if (progress <= 66) {
+            bar.classList.add('progress-medium');
+        } else {
+            bar.classList.add('progress-high');
+        }
+    });
+});
+
+// Initialize SocketIO connection
+const socket = io();
+
+// Listen for subtask status changes
+socket.on('subtask_status_changed', function(data) {
+    // Reload the page to update progress (or update specific progress bars)
+    // For now, we'll reload to ensure accuracy
+    location.reload();
+});
+
+// Listen for task status changes
+socket.on('task_status_changed', function(data) {
+    // Reload the page to update progress
+    location.reload();
+});
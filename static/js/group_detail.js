@@ -0,0 +1,245 @@
+function confirmDelete() {
+    document.getElementById('delete-modal').style.display = 'flex';
+}
+
+function closeDeleteModal() {
+    document.getElementById('delete-modal').style.display = 'none';
+}
+
+function toggleInviteForm() {
+    const form = document.getElementById('invite-form');
+    form.style.display = form.style.display === 'none' ? 'block' : 'none';
+}
+
+// Close modal if clicked outside
+document.getElementById('delete-modal').addEventListener('click', function(e) {
+    if (e.target === this) {
+        closeDeleteModal();
+    }
+});
+
+// SocketIO Chat Functionality
+const groupId = PAGE.groupId;
+const socket = io();
+
+// Last group event seen with nothing missing before it; sent on (re)connect so
+// the server replays only missed events
+let lastSeq = PAGE.eventSeq;
+
+// Seqs are allocated before events are saved and emitted, so concurrent events
+// can arrive out of order. Later ones are remembered here until the gap fills;
+// a gap still open after GAP_REPLAY_DELAY is requested as a replay.
+const seenSeqs = new Set();
+const GAP_REPLAY_DELAY = 2000;
+let gapTimer = null;
+
+function isNewEvent(data) {
+    if (data.seq === undefined) {
+        return true;
+    }
+    if (data.seq <= lastSeq || seenSeqs.has(data.seq)) {
+        return false;
+    }
+    seenSeqs.add(data.seq);
+    while (seenSeqs.delete(lastSeq + 1)) {
+        lastSeq++;
+    }
+    if (seenSeqs.size && !gapTimer) {
+        gapTimer = setTimeout(function() {
+            gapTimer = null;
+            if (seenSeqs.size) {
+                joinGroup();
+            }
+        }, GAP_REPLAY_DELAY);
+    }
+    return true;
+}
+
+function joinGroup() {
+    socket.emit('join_group', { group_id: groupId, since: lastSeq });
+}
+
+// Join group room when page loads, and catch up after a reconnect
+socket.on('connect', joinGroup);
+
+// Online presence
+function setOnline(userIds) {
+    const online = new Set(userIds);
+    document.querySelectorAll('.member-item[data-user-id]').forEach(function(item) {
+        const dot = item.querySelector('.presence-dot');
+        const isOnline = online.has(item.getAttribute('data-user-id'));
+        dot.classList.toggle('online', isOnline);
+        dot.title = isOnline ? 'Online' : 'Offline';
+    });
+}
+
+socket.on('joined_group', function(data) {
+    if (data.group_id === groupId && data.online) {
+        setOnline(data.online);
+    }
+});
+
+socket.on('presence_changed', function(data) {
+    if (data.group_id === groupId) {
+        setOnline(data.online);
+    }
+});
+
+// Heartbeats only refresh in-memory presence on the server
+setInterval(function() {
+    if (socket.connected) {
+        socket.emit('presence_heartbeat');
+    }
+}, 30000);
+
+// Too far behind to replay missed events, reload the page instead
+socket.on('group_snapshot', function(data) {
+    if (data.group_id === groupId) {
+        location.reload();
+    }
+});
+
+// Leave group room when page unloads
+window.addEventListener('beforeunload', function() {
+    socket.emit('leave_group', { group_id: groupId });
+});
+
+// Handle receiving new messages
+socket.on('message_received', function(data) {
+    if (!isNewEvent(data)) {
+        return;
+    }
+    
+    const chatMessages = document.getElementById('chat-messages');
+    
+    // Remove empty state message if present
+    const emptyState = chatMessages.querySelector('.empty-state');
+    if (emptyState) {
+        emptyState.remove();
+    }
+    
+    // Create message element
+    const messageDiv = document.createElement('div');
+    messageDiv.className = 'chat-message';
+    messageDiv.setAttribute('data-message-id', data.message_id);
+    
+    const timestamp = new Date(data.timestamp);
+    const timeString = timestamp.toLocaleTimeString('en-US', { 
+        hour: '2-digit', 
+        minute: '2-digit',
+        hour12: true 
+    });
+    
+    messageDiv.innerHTML = `
+        <div class="chat-message-header">
+            <strong class="chat-message-sender">${data.user_name}</strong>
+            <span class="chat-message-time">${timeString}</span>
+        </div>
+        <div class="chat-message-text">${escapeHtml(data.message)}</div>
+    `;
+    
+    chatMessages.appendChild(messageDiv);
+    scrollChatToBottom();
+});
+
+// Handle errors
+socket.on('error', function(data) {
+    console.error('SocketIO error:', data.message);
+    alert('Error: ' + data.message);
+});
+
+// Handle rate limiting; a throttled join (e.g. everyone reconnecting after a
+// restart) is retried, otherwise the page would never rejoin the room
+socket.on('throttled', function(data) {
+    console.warn('SocketIO throttled:', data.event, data.retry_after);
+    if (data.event === 'join_group') {
+        setTimeout(joinGroup, data.retry_after * 1000);
+    } else if (data.event === 'send_message') {
+        alert('You are sending messages too quickly. Try again in ' + Math.ceil(data.retry_after) + ' second(s).');
+    }
+});
+
+// Send message function
+function sendMessage() {
+    const input = document.getElementById('chat-input');
+    const message = input.value.trim();
+    
+    if (!message) {
+        return;
+    }
+    
+    // Disable input while sending
+    input.disabled = true;
+    document.getElementById('chat-send-btn').disabled = true;
+    
+    socket.emit('send_message', {
+        group_id: groupId,
+        message: message
+    }, function(response) {
+        // Re-enable input after sending; keep the text if the server throttled it
+        input.disabled = false;
+        document.getElementById('chat-send-btn').disabled = false;
+        if (!(response && response.throttled)) {
+            input.value = '';
+        }
+        input.focus();
+    });
+}
+
+// Send message on button click
+document.getElementById('chat-send-btn').addEventListener('click', sendMessage);
+
+// Send message on Enter key
+document.getElementById('chat-input').addEventListener('keypress', function(e) {
+    if (e.key === 'Enter') {
+        sendMessage();
+    }
+});
+
+// Scroll chat to bottom
+function scrollChatToBottom() {
+    const chatMessages = document.getElementById('chat-messages');
+    chatMessages.scrollTop = chatMessages.scrollHeight;
+}
+
+// Scroll to bottom on page load
+window.addEventListener('load', function() {
+    scrollChatToBottom();
+});
+
+// Escape HTML to prevent XSS
+function escapeHtml(text) {
+    const map = {
+        '&': '&amp;',
+        '<': '&lt;',
+        '>': '&gt;',
+        '"': '&quot;',
+        "'": '&#039;'
+    };
+    return text.replace(/[&<>"']/g, function(m) { return map[m]; });
+}
+
+// Real-time Subtask Status Updates
+socket.on('subtask_status_changed', function(data) {
+    // Reload the page to show updated subtask statuses
+    // In a more sophisticated implementation, we could update specific elements
+    if (data.group_id === groupId && isNewEvent(data)) {
+        location.reload();
+    }
+});
+
+// Real-time Task Status Updates
+socket.on('task_status_changed', function(data) {
+    // Reload the page to show updated task statuses
+    if (data.group_id === groupId && isNewEvent(data)) {
+        location.reload();
+    }
+});
+
+// Real-time Progress Updates
+socket.on('progress_updated', function(data) {
+    // Reload the page to show updated progress
+    if (data.group_id === groupId) {
+        location.reload();
+    }
+});
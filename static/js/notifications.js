@@ -0,0 +1,19 @@
+// Due date notifications sent to the user's personal room
+socket.on('due_date_notification', function(data) {
+    const container = document.querySelector('.main-content');
+    let list = container.querySelector('.flash-messages');
+    if (!list) {
+        list = document.createElement('div');
+        list.className = 'flash-messages';
+        container.prepend(list);
+    }
+    
+    data.tasks.forEach(function(task) {
+        const item = document.createElement('div');
+        item.className = 'flash-message ' + (task.kind === 'overdue' ? 'flash-error' : 'flash-info');
+        item.textContent = task.kind === 'overdue'
+            ? `Task "${task.title}" is overdue (due ${task.due_date}).`
+            : `Task "${task.title}" is due ${task.due_date}.`;
+        list.appendChild(item);
+    });
+});
@@ -0,0 +1,164 @@
+// SocketIO connection for real-time updates
+const socket = io();
+const taskGroupId = PAGE.groupId;
+
+// Last group event seen with nothing missing before it; sent on (re)connect so
+// the server replays only missed events
+let lastSeq = PAGE.eventSeq;
+
+// Seqs are allocated before events are saved and emitted, so concurrent events
+// can arrive out of order. Later ones are remembered here until the gap fills;
+// a gap still open after GAP_REPLAY_DELAY is requested as a replay.
+const seenSeqs = new Set();
+const GAP_REPLAY_DELAY = 2000;
+let gapTimer = null;
+
+function isNewEvent(data) {
+    if (data.seq === undefined) {
+        return true;
+    }
+    if (data.seq <= lastSeq || seenSeqs.has(data.seq)) {
+        return false;
+    }
+    seenSeqs.add(data.seq);
+    while (seenSeqs.delete(lastSeq + 1)) {
+        lastSeq++;
+    }
+    if (seenSeqs.size && !gapTimer) {
+        gapTimer = setTimeout(function() {
+            gapTimer = null;
+            if (seenSeqs.size) {
+                joinGroup();
+            }
+        }, GAP_REPLAY_DELAY);
+    }
+    return true;
+}
+
+function joinGroup() {
+    socket.emit('join_group', { group_id: taskGroupId, since: lastSeq });
+}
+
+// Join group room when page loads, and catch up after a reconnect
+socket.on('connect', joinGroup);
+
+// A throttled join (e.g. everyone reconnecting after a restart) is retried,
+// otherwise the page would never rejoin the room
+socket.on('throttled', function(data) {
+    console.warn('SocketIO throttled:', data.event, data.retry_after);
+    if (data.event === 'join_group') {
+        setTimeout(joinGroup, data.retry_after * 1000);
+    }
+});
+
+// Too far behind to replay missed events, reload the page instead
+socket.on('group_snapshot', function(data) {
+    if (data.group_id === taskGroupId) {
+        location.reload();
+    }
+});
+
+// Leave group room when page unloads
+window.addEventListener('beforeunload', function() {
+    socket.emit('leave_group', { group_id: taskGroupId });
+});
+
+// Handle subtask status updates (the bulk dropdown shares the class but has no subtask id)
+document.querySelectorAll('.subtask-status-select[data-subtask-id]').forEach(function(select) {
+    select.addEventListener('change', function() {
+        const subtaskId = this.getAttribute('data-subtask-id');
+        const newStatus = this.value;
+        
+        this.disabled = true;
+        
+        fetch(`/subtask/${subtaskId}/update_status`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ status: newStatus })
+        })
+        .then(response => response.json())
+        .then(data => {
+            if (data.success) {
+                location.reload();
+            } else {
+                alert('Error updating subtask status: ' + (data.error || 'Unknown error'));
+                location.reload();
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            alert('Error updating subtask status');
+            location.reload();
+        });
+    });
+});
+
+// Bulk subtask status updates
+function bulkUpdateSubtasks(status, subtaskIds) {
+    const body = { status: status };
+    if (subtaskIds) {
+        body.subtask_ids = subtaskIds;
+    }
+    
+    fetch(PAGE.bulkStatusUrl, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(body)
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.success) {
+            alert('Error updating subtasks: ' + (data.error || 'Unknown error'));
+        }
+        location.reload();
+    })
+    .catch(error => {
+        console.error('Error:', error);
+        alert('Error updating subtasks');
+        location.reload();
+    });
+}
+
+const selectAll = document.getElementById('subtask-select-all');
+if (selectAll) {
+    selectAll.addEventListener('change', function() {
+        document.querySelectorAll('.subtask-select').forEach(function(box) {
+            box.checked = selectAll.checked;
+        });
+    });
+    
+    document.getElementById('bulk-status-apply').addEventListener('click', function() {
+        const ids = Array.from(document.querySelectorAll('.subtask-select:checked')).map(function(box) {
+            return box.value;
+        });
+        if (ids.length === 0) {
+            alert('Select at least one subtask.');
+            return;
+        }
+        bulkUpdateSubtasks(document.getElementById('bulk-status-select').value, ids);
+    });
+    
+    document.getElementById('bulk-status-reset').addEventListener('click', function() {
+        if (confirm('Reset all subtasks to Not Started?')) {
+            bulkUpdateSubtasks('not_started', null);
+        }
+    });
+}
+
+// Real-time Subtask Status Updates
+socket.on('subtask_status_changed', function(data) {
+    if (data.group_id === taskGroupId && isNewEvent(data)) {
+        location.reload();
+    }
+});
+
+// Real-time Task Status Updates
+socket.on('task_status_changed', function(data) {
+    if (data.group_id === taskGroupId && isNewEvent(data) && data.task_id === PAGE.taskId) {
+        location.reload();
+    }
+});
@@ -0,0 +1,10 @@
+from app import create_app
+from app.scheduler import run_scheduler
+
+# Standalone due date scheduler. Run with DUE_DATE_SCHEDULER_ENABLED=false on
+# the web service and SOCKETIO_MESSAGE_QUEUE set on both, so notifications
+# emitted here reach browsers connected to the web workers.
+app = create_app()
+
+if __name__ == "__main__":
+    run_scheduler(app)